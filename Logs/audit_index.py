@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Audit Log Index
+
+Persistent SQLite secondary index over the segment store, so searches cost
+time proportional to the result set instead of the whole history:
+- Timestamp, actor, action (prefix) and status lookups via B-tree indexes
+- Target substring search via a trigram posting table
+- Maintained incrementally from the store's commit hook
+- Catch-up and full rebuild for a missing or stale index
+- Hosts the minute/hour/day rollup tables (see audit_rollup.py)
+
+The index only stores positions; entries are read back from their segments.
+
+Gold Tier Feature #3
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Set, Iterator
+
+try:
+    from .audit_store import SEGMENT_SUFFIX, SegmentStore, Record
+    from .audit_rollup import ROLLUP_SCHEMA, Aggregate, update_rollups, query_rollups, drop_rollups_before
+except ImportError:
+    # Running as a script from the Logs directory
+    from audit_store import SEGMENT_SUFFIX, SegmentStore, Record
+    from audit_rollup import ROLLUP_SCHEMA, Aggregate, update_rollups, query_rollups, drop_rollups_before
+
+# Configuration
+INDEX_FILENAME = "audit_index.sqlite3"
+SYNC_BATCH_SIZE = 1000
+FETCH_BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    indexed_bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    actor TEXT,
+    action TEXT,
+    status TEXT,
+    target TEXT,
+    segment_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    UNIQUE (segment_id, offset)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_ts ON entries (ts);
+CREATE INDEX IF NOT EXISTS idx_entries_actor ON entries (actor, ts);
+CREATE INDEX IF NOT EXISTS idx_entries_action ON entries (action, ts);
+CREATE INDEX IF NOT EXISTS idx_entries_status ON entries (status, ts);
+CREATE TABLE IF NOT EXISTS target_trigrams (
+    trigram TEXT NOT NULL,
+    entry_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, entry_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_trigrams_entry ON target_trigrams (entry_id);
+""" + ROLLUP_SCHEMA
+
+
+class AuditIndex:
+    """SQLite index of audit entry positions in the segment store."""
+
+    def __init__(self, store: SegmentStore, path: Optional[Path] = None):
+        """
+        Open (or create) the index for a store.
+
+        Args:
+            store: Segment store being indexed
+            path: Index database file (default: <audit dir>/audit_index.sqlite3)
+        """
+        self.store = store
+        self.path = Path(path) if path else store.root / INDEX_FILENAME
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._segment_ids: Dict[str, int] = {}
+        self._synced = False
+
+    # Maintenance
+
+    def add_records(self, records: List[Record]):
+        """Index a committed batch (registered as the store's commit hook)."""
+        if not records:
+            return
+
+        with self._lock:
+            self._transaction(self._insert, records, contiguous=True)
+
+    def _transaction(self, func, *args, **kwargs):
+        cursor = self._conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            func(cursor, *args, **kwargs)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            self._segment_ids.clear()
+            self._synced = False
+            raise
+
+    def _insert(self, cursor: sqlite3.Cursor, records: List[Record], contiguous: bool):
+        spans: Dict[int, List[int]] = {}  # segment id -> [first offset, end offset]
+        inserted = []
+
+        for path, offset, length, entry in records:
+            segment_id = self._segment_id(cursor, self._relpath(path))
+            cursor.execute(
+                "INSERT OR IGNORE INTO entries (ts, actor, action, status, target, segment_id, offset, length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.get("timestamp"),
+                    entry.get("actor"),
+                    entry.get("action"),
+                    entry.get("status"),
+                    entry.get("target") or "",
+                    segment_id,
+                    offset,
+                    length
+                )
+            )
+            if cursor.rowcount:
+                inserted.append(entry)
+                entry_id = cursor.lastrowid
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO target_trigrams (trigram, entry_id) VALUES (?, ?)",
+                    [(gram, entry_id) for gram in _trigrams(entry.get("target") or "")]
+                )
+
+            span = spans.setdefault(segment_id, [offset, offset])
+            span[1] = offset + length
+
+        # Entries already indexed (e.g. seen again by a catch-up) are not rolled up twice
+        update_rollups(cursor, inserted)
+
+        for segment_id, (first, end) in spans.items():
+            if contiguous:
+                # Only advance the high-water mark over a gap-free prefix; another
+                # process may have appended records we have not indexed yet.
+                cursor.execute(
+                    "UPDATE segments SET indexed_bytes = ? WHERE id = ? AND indexed_bytes = ?",
+                    (end, segment_id, first)
+                )
+            else:
+                cursor.execute(
+                    "UPDATE segments SET indexed_bytes = MAX(indexed_bytes, ?) WHERE id = ?",
+                    (end, segment_id)
+                )
+
+    def _segment_id(self, cursor: sqlite3.Cursor, relpath: str) -> int:
+        segment_id = self._segment_ids.get(relpath)
+        if segment_id is None:
+            cursor.execute("INSERT OR IGNORE INTO segments (path) VALUES (?)", (relpath,))
+            segment_id = cursor.execute("SELECT id FROM segments WHERE path = ?", (relpath,)).fetchone()[0]
+            self._segment_ids[relpath] = segment_id
+        return segment_id
+
+    def _relpath(self, segment: Path) -> str:
+        return Path(segment).relative_to(self.store.segments_dir).as_posix()
+
+    def sync(self) -> int:
+        """
+        Bring the index up to date with the segments on disk.
+
+        Indexes records past each segment's high-water mark and drops
+        segments that no longer exist.
+
+        Returns:
+            Number of records indexed
+        """
+        self.store.flush()
+        indexed = 0
+
+        with self._lock:
+            known = {
+                path: (segment_id, indexed_bytes)
+                for segment_id, path, indexed_bytes in self._conn.execute(
+                    "SELECT id, path, indexed_bytes FROM segments"
+                )
+            }
+
+            on_disk = set()
+            for segment in self.store.segments():
+                relpath = self._relpath(segment)
+                on_disk.add(relpath)
+                if relpath in known and segment.suffix != SEGMENT_SUFFIX:
+                    continue  # Compacted segments are immutable
+                done = known.get(relpath, (None, 0))[1]
+                if segment.stat().st_size <= done:
+                    continue
+
+                batch: List[Record] = []
+                for offset, length, entry in self.store.read_records(segment, start=done):
+                    batch.append((segment, offset, length, entry))
+                    if len(batch) >= SYNC_BATCH_SIZE:
+                        self._transaction(self._insert, batch, contiguous=False)
+                        indexed += len(batch)
+                        batch = []
+                if batch:
+                    self._transaction(self._insert, batch, contiguous=False)
+                    indexed += len(batch)
+
+            stale = [segment_id for path, (segment_id, _) in known.items() if path not in on_disk]
+            if stale:
+                self._transaction(self._drop_segments, stale)
+
+            self._synced = True
+
+        return indexed
+
+    def _drop_segments(self, cursor: sqlite3.Cursor, segment_ids: List[int]):
+        for segment_id in segment_ids:
+            cursor.execute(
+                "DELETE FROM target_trigrams WHERE entry_id IN (SELECT id FROM entries WHERE segment_id = ?)",
+                (segment_id,)
+            )
+            cursor.execute("DELETE FROM entries WHERE segment_id = ?", (segment_id,))
+            cursor.execute("DELETE FROM segments WHERE id = ?", (segment_id,))
+        self._segment_ids.clear()
+
+    def rename_segment(self, old: Path, new: Path):
+        """Point index entries at a segment's new (e.g. compacted) file."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE segments SET path = ? WHERE path = ?",
+                (self._relpath(new), self._relpath(old))
+            )
+            self._segment_ids.clear()
+
+    def drop_partitions_before(self, day: str) -> int:
+        """
+        Forget every segment of the day partitions older than a day.
+
+        Args:
+            day: First day to keep (YYYY-MM-DD)
+
+        Returns:
+            Number of segments dropped
+        """
+        with self._lock:
+            # Segment paths start with their partition's day, so this is a range scan
+            stale = [
+                segment_id for (segment_id,) in self._conn.execute(
+                    "SELECT id FROM segments WHERE path < ?", (f"{day}/",)
+                )
+            ]
+            if stale:
+                self._transaction(self._drop_segments, stale)
+            self._transaction(drop_rollups_before, day)
+        return len(stale)
+
+    def rebuild(self) -> int:
+        """
+        Drop the index and rebuild it from every segment.
+
+        Returns:
+            Number of records indexed
+        """
+        with self._lock:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS target_trigrams;"
+                "DROP TABLE IF EXISTS entries;"
+                "DROP TABLE IF EXISTS segments;"
+                "DROP TABLE IF EXISTS rollup_counts;"
+                "DROP TABLE IF EXISTS rollup_buckets;"
+            )
+            self._conn.executescript(SCHEMA)
+            self._segment_ids.clear()
+            self._synced = False
+
+        return self.sync()
+
+    # Queries
+
+    def query(
+        self,
+        actor: Optional[str] = None,
+        action: Optional[str] = None,
+        target: Optional[str] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        descending: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Find entries matching every given filter.
+
+        Args:
+            actor: Exact actor
+            action: Action prefix
+            target: Substring of the target
+            status: Exact status
+            start_date: Earliest timestamp, inclusive
+            end_date: Latest timestamp, inclusive
+            descending: Newest first (default) or oldest first
+
+        Returns:
+            Matching log entries ordered by timestamp
+        """
+        return list(self.iter_query(
+            actor=actor,
+            action=action,
+            target=target,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+            descending=descending
+        ))
+
+    def iter_query(
+        self,
+        actor: Optional[str] = None,
+        action: Optional[str] = None,
+        target: Optional[str] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        descending: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """Like query(), but stream entries in batches of FETCH_BATCH_SIZE."""
+        self.store.flush()
+        if not self._synced:
+            self.sync()
+
+        clauses = []
+        params: List[Any] = []
+
+        if actor:
+            clauses.append("e.actor = ?")
+            params.append(actor)
+        if action:
+            clauses.append("e.action >= ? AND e.action < ?")
+            params += [action, action[:-1] + chr(ord(action[-1]) + 1)]
+        if status:
+            clauses.append("e.status = ?")
+            params.append(status)
+        if start_date:
+            clauses.append("e.ts >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            clauses.append("e.ts <= ?")
+            params.append(end_date.isoformat())
+        if target:
+            grams = sorted(_trigrams(target))
+            if grams:
+                postings = " INTERSECT ".join(["SELECT entry_id FROM target_trigrams WHERE trigram = ?"] * len(grams))
+                clauses.append(f"e.id IN ({postings})")
+                params += grams
+            clauses.append("instr(e.target, ?) > 0")
+            params.append(target)
+
+        sql = "SELECT s.path, e.offset, e.length FROM entries e JOIN segments s ON s.id = e.segment_id"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY e.ts {'DESC' if descending else 'ASC'}, e.id"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        for start in range(0, len(rows), FETCH_BATCH_SIZE):
+            yield from self._fetch(rows[start:start + FETCH_BATCH_SIZE])
+
+    def latest_per_target(self, action: str, before: datetime) -> List[Dict[str, Any]]:
+        """
+        The newest entry for each target, among those older than a cutoff.
+
+        Used to seed state (e.g. a circuit breaker's) that was last changed
+        before a report window, without reading every older entry.
+
+        Args:
+            action: Exact action
+            before: Only entries strictly older than this
+
+        Returns:
+            One log entry per target, newest first
+        """
+        self.store.flush()
+        if not self._synced:
+            self.sync()
+
+        # SQLite returns the row holding MAX(ts) for the bare id column
+        sql = (
+            "SELECT s.path, e.offset, e.length FROM entries e JOIN segments s ON s.id = e.segment_id "
+            "WHERE e.id IN (SELECT id FROM (SELECT id, MAX(ts) FROM entries "
+            "WHERE action = ? AND ts < ? GROUP BY target)) "
+            "ORDER BY e.ts DESC, e.id"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (action, before.isoformat())).fetchall()
+
+        return self._fetch(rows)
+
+    def rollup(self, ranges: List[tuple]) -> Aggregate:
+        """
+        Merge rollup buckets into one aggregate.
+
+        Args:
+            ranges: (granularity, first bucket, end bucket or None) triples
+
+        Returns:
+            Aggregate over the selected buckets
+        """
+        self.store.flush()
+        if not self._synced:
+            self.sync()
+        with self._lock:
+            return query_rollups(self._conn, ranges)
+
+    def count(self) -> int:
+        """Number of indexed entries."""
+        if not self._synced:
+            self.sync()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _fetch(self, rows: List[tuple]) -> List[Dict[str, Any]]:
+        """Read entries for (path, offset, length) rows, one pass per segment."""
+        by_segment: Dict[str, List[tuple]] = {}
+        for position, (path, offset, length) in enumerate(rows):
+            by_segment.setdefault(path, []).append((offset, length, position))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+        for path, spans in by_segment.items():
+            spans.sort()
+            try:
+                entries = self.store.read_at(self.store.segments_dir / path, [(o, n) for o, n, _ in spans])
+            except OSError:
+                self._synced = False  # Segment removed behind our back
+                continue
+            for (_, _, position), entry in zip(spans, entries):
+                results[position] = entry
+
+        return [entry for entry in results if entry is not None]
+
+
+def _trigrams(text: str) -> Set[str]:
+    """All 3-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# One index per store, registered as its commit hook
+_indexes: Dict[int, AuditIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(store: SegmentStore) -> AuditIndex:
+    """Get or create the shared index for a store."""
+    with _indexes_lock:
+        index = _indexes.get(id(store))
+        if index is None:
+            index = AuditIndex(store)
+            store.add_commit_hook(index.add_records)
+            _indexes[id(store)] = index
+        return index
@@ -4,46 +4,68 @@ Enhanced Audit Logger for AI Employee
 
 Provides enterprise-grade audit logging with:
 - Structured JSON logs
+- Append-only segmented storage (see audit_store.py)
+- Indexed search (see audit_index.py)
 - 90-day retention
 - Searchable by all fields
-- Automatic cleanup
+- Automatic cleanup by whole day partitions
+- Compaction of older partitions
 - Security event tracking
 
 Gold Tier Feature #3
 """
 
 import json
-import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import hashlib
 
+try:
+    from .audit_store import DEFAULT_DURABILITY, get_store, migrate_legacy_logs
+    from .audit_index import get_index
+    from .vault_io import new_id
+except ImportError:
+    # Running as a script from the Logs directory
+    from audit_store import DEFAULT_DURABILITY, get_store, migrate_legacy_logs
+    from audit_index import get_index
+    from vault_io import new_id
+
 # Configuration
 VAULT_PATH = Path(__file__).parent.parent  # AI_Employee_Vault root
 AUDIT_DIR = Path(__file__).parent / "audit"
 RETENTION_DAYS = 90
+COMPACT_AFTER_DAYS = 7
 SCHEMA_FILE = AUDIT_DIR / "audit_schema.json"
 
 
 class AuditLogger:
     """Enhanced audit logging system with structured data and retention."""
 
-    def __init__(self, actor: str = "AI_Employee"):
+    def __init__(self, actor: str = "AI_Employee", durability: str = DEFAULT_DURABILITY,
+                 audit_dir: Optional[Path] = None):
         """
         Initialize audit logger.
 
         Args:
             actor: Who is performing the action (e.g., "AI_Employee", "User", "System")
+            durability: When entries hit disk - "async" (group commit), "sync" or "fsync"
+            audit_dir: Audit directory (default: Logs/audit); tests and
+                benchmarks pass a scratch directory
         """
         self.actor = actor
+        self.durability = durability
         self.session_id = self._generate_session_id()
+        self.audit_dir = Path(audit_dir) if audit_dir is not None else AUDIT_DIR
+        self.schema_file = self.audit_dir / SCHEMA_FILE.name
 
         # Ensure audit directory exists
-        AUDIT_DIR.mkdir(parents=True, exist_ok=True)
+        self.audit_dir.mkdir(parents=True, exist_ok=True)
+        self.store = get_store(self.audit_dir)
+        self.index = get_index(self.store)
 
         # Initialize schema if it doesn't exist
-        if not SCHEMA_FILE.exists():
+        if not self.schema_file.exists():
             self._initialize_schema()
 
     def _generate_session_id(self) -> str:
@@ -58,6 +80,11 @@ class AuditLogger:
             "description": "Audit log schema for AI Employee",
             "retention_days": RETENTION_DAYS,
             "fields": {
+                "entry_id": {
+                    "type": "string",
+                    "description": "Unique, time-ordered entry identifier (see vault_io.new_id)",
+                    "required": False
+                },
                 "timestamp": {
                     "type": "string",
                     "format": "ISO8601",
@@ -127,7 +154,7 @@ class AuditLogger:
             }
         }
 
-        with open(SCHEMA_FILE, 'w') as f:
+        with open(self.schema_file, 'w') as f:
             json.dump(schema, f, indent=2)
 
     def log(
@@ -155,10 +182,11 @@ class AuditLogger:
             security_level: Security classification
 
         Returns:
-            Path to the log entry file
+            Path to the segment file holding the entry
         """
         timestamp = datetime.now()
         log_entry = {
+            "entry_id": new_id(),
             "timestamp": timestamp.isoformat(),
             "session_id": self.session_id,
             "actor": self.actor,
@@ -172,15 +200,30 @@ class AuditLogger:
             "security_level": security_level
         }
 
-        # Generate log filename (YYYY-MM-DD_HH-MM-SS_action.json)
-        filename = f"{timestamp.strftime('%Y-%m-%d_%H-%M-%S')}_{action}.json"
-        log_path = AUDIT_DIR / filename
+        # Append to the day's segment (group-committed per durability mode)
+        return self.store.append(log_entry, self.durability)
 
-        # Write log entry
-        with open(log_path, 'w') as f:
-            json.dump(log_entry, f, indent=2)
+    def flush(self):
+        """Write any buffered entries to disk."""
+        self.store.flush()
 
-        return str(log_path)
+    def migrate_legacy_logs(self) -> int:
+        """
+        Fold legacy one-file-per-entry logs (audit/*.json) into segments.
+
+        Returns:
+            Number of entries migrated
+        """
+        return migrate_legacy_logs(self.store, self.audit_dir, exclude=(self.schema_file.name,))
+
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the search index from the segments (use when missing or stale).
+
+        Returns:
+            Number of entries indexed
+        """
+        return self.index.rebuild()
 
     def log_file_operation(
         self,
@@ -263,24 +306,39 @@ class AuditLogger:
         """
         Remove audit logs older than retention period.
 
+        Whole day partitions are removed, so expiry costs one directory
+        removal per day rather than one unlink per entry.
+
         Args:
             retention_days: How many days to keep logs (default: 90)
+
+        Returns:
+            Number of day partitions removed
         """
-        cutoff_date = datetime.now() - timedelta(days=retention_days)
-        deleted_count = 0
+        cutoff_day = (datetime.now() - timedelta(days=retention_days)).strftime('%Y-%m-%d')
 
-        for log_file in AUDIT_DIR.glob("*.json"):
-            # Skip schema file
-            if log_file.name == "audit_schema.json":
-                continue
+        dropped = self.store.drop_partitions_before(cutoff_day)
+        self.index.drop_partitions_before(cutoff_day)
 
-            # Check file modification time
-            file_time = datetime.fromtimestamp(log_file.stat().st_mtime)
-            if file_time < cutoff_date:
-                log_file.unlink()
-                deleted_count += 1
+        return len(dropped)
 
-        return deleted_count
+    def compact_old_logs(self, older_than_days: int = COMPACT_AFTER_DAYS, codec: str = "gzip") -> int:
+        """
+        Compress closed day partitions; they stay searchable and analyzable.
+
+        Args:
+            older_than_days: Compact partitions older than this many days
+            codec: "gzip" or "zstd" (requires the zstandard package)
+
+        Returns:
+            Number of segments compressed
+        """
+        cutoff_day = (datetime.now() - timedelta(days=older_than_days)).strftime('%Y-%m-%d')
+        return self.store.compact_partitions_before(
+            cutoff_day,
+            codec=codec,
+            on_compacted=self.index.rename_segment
+        )
 
     def get_recent_logs(self, hours: int = 24) -> List[Dict]:
         """
@@ -293,18 +351,7 @@ class AuditLogger:
             List of log entries
         """
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_logs = []
-
-        for log_file in sorted(AUDIT_DIR.glob("*.json")):
-            if log_file.name == "audit_schema.json":
-                continue
-
-            file_time = datetime.fromtimestamp(log_file.stat().st_mtime)
-            if file_time >= cutoff_time:
-                with open(log_file, 'r') as f:
-                    recent_logs.append(json.load(f))
-
-        return recent_logs
+        return self.index.query(start_date=cutoff_time, descending=False)
 
     def search_logs(
         self,
@@ -329,38 +376,14 @@ class AuditLogger:
         Returns:
             List of matching log entries
         """
-        matching_logs = []
-
-        for log_file in AUDIT_DIR.glob("*.json"):
-            if log_file.name == "audit_schema.json":
-                continue
-
-            with open(log_file, 'r') as f:
-                log_entry = json.load(f)
-
-            # Apply filters
-            if actor and log_entry.get("actor") != actor:
-                continue
-
-            if action and not log_entry.get("action", "").startswith(action):
-                continue
-
-            if target and target not in log_entry.get("target", ""):
-                continue
-
-            if status and log_entry.get("status") != status:
-                continue
-
-            # Date range filtering
-            log_time = datetime.fromisoformat(log_entry["timestamp"])
-            if start_date and log_time < start_date:
-                continue
-            if end_date and log_time > end_date:
-                continue
-
-            matching_logs.append(log_entry)
-
-        return sorted(matching_logs, key=lambda x: x["timestamp"], reverse=True)
+        return self.index.query(
+            actor=actor,
+            action=action,
+            target=target,
+            status=status,
+            start_date=start_date,
+            end_date=end_date
+        )
 
 
 # Convenience function for quick logging
@@ -372,6 +395,25 @@ def audit_log(action: str, target: str, status: str, **kwargs):
 
 # Example usage
 if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "migrate":
+        migrated = AuditLogger(actor="System").migrate_legacy_logs()
+        print(f"Migrated {migrated} legacy log files into segments")
+        sys.exit(0)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "cleanup":
+        logger = AuditLogger(actor="System")
+        dropped = logger.cleanup_old_logs()
+        compacted = logger.compact_old_logs()
+        print(f"Removed {dropped} expired day partitions, compacted {compacted} segments")
+        sys.exit(0)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "reindex":
+        indexed = AuditLogger(actor="System").rebuild_index()
+        print(f"Indexed {indexed} audit entries")
+        sys.exit(0)
+
     # Demo the audit logger
     logger = AuditLogger(actor="AI_Employee")
 
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Audit Log Rollups
+
+Mergeable aggregates of audit entries. Every statistic the analyzer reports
+is computed by a single add() per entry, and aggregates for adjacent time
+buckets merge into the aggregate for a larger window.
+
+Minute/hour/day rollup buckets are maintained on write (in the audit index
+database, in the same transaction as the index rows) so reports read a few
+buckets instead of every raw entry.
+
+Gold Tier Feature #3
+"""
+
+import math
+from collections import Counter
+from typing import Dict, Any, Optional, List
+
+# Operations slower than this are reported as anomalies
+SLOW_OPERATION_MS = 5000
+
+# Quantile sketches: every reported quantile is within 1% of a true sample
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_MAX_BINS = 2048
+ZERO_KEY = "zero"
+# Exact smallest and largest sample, and how many samples they cover (rollup
+# buckets written before they were stored have none)
+MIN_KEY = "min"
+MAX_KEY = "max"
+BOUNDED_KEY = "bounded"
+REPORTED_QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p99_9": 0.999}
+
+
+class QuantileSketch:
+    """
+    Mergeable relative-error quantile sketch (DDSketch-style).
+
+    Values are counted in logarithmic bins, so memory is bounded by the
+    dynamic range (about 700 bins for 1ms..1h at 1% accuracy) and never by
+    the number of samples. Sketches merge by adding bin counts.
+
+    The exact minimum and maximum are kept too: estimates are clamped to
+    them, so no quantile falls outside the observed range, and a single
+    sample is reported exactly.
+    """
+
+    GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+    LOG_GAMMA = math.log(GAMMA)
+
+    def __init__(self):
+        self.count = 0
+        self.zero_count = 0
+        self.bins: Counter = Counter()
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.bounded = 0  # Samples covered by min and max
+
+    def add(self, value: float, count: int = 1):
+        self.count += count
+        self.bounded += count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value <= 0:
+            self.zero_count += count
+            return
+        self.bins[math.ceil(math.log(value) / self.LOG_GAMMA)] += count
+        if len(self.bins) > SKETCH_MAX_BINS:
+            self._collapse()
+
+    def add_bin(self, key, count: int):
+        """Add a stored (bin key, count) pair, e.g. read from the rollup tables."""
+        if key == MIN_KEY:
+            self.min = count if self.min is None else min(self.min, count)
+            return
+        if key == MAX_KEY:
+            self.max = count if self.max is None else max(self.max, count)
+            return
+        if key == BOUNDED_KEY:
+            self.bounded += count
+            return
+
+        self.count += count
+        if key == ZERO_KEY:
+            self.zero_count += count
+        else:
+            self.bins[key] += count
+
+    def items(self):
+        """(bin key, count) pairs for storage."""
+        if self.zero_count:
+            yield ZERO_KEY, self.zero_count
+        yield from self.bins.items()
+        if self.bounded:
+            yield MIN_KEY, self.min
+            yield MAX_KEY, self.max
+            yield BOUNDED_KEY, self.bounded
+
+    def merge(self, other: "QuantileSketch"):
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.bins.update(other.bins)
+        self.bounded += other.bounded
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        if len(self.bins) > SKETCH_MAX_BINS:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1), or None when empty."""
+        if not self.count:
+            return None
+
+        exact = self.bounded == self.count and self.min is not None
+        if exact and self.count == 1:
+            return self.min
+        estimate = self._estimate(q)
+        return min(max(estimate, self.min), self.max) if exact else estimate
+
+    def _estimate(self, q: float) -> float:
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return 2 * self.GAMMA ** key / (self.GAMMA + 1)
+        return 2 * self.GAMMA ** max(self.bins) / (self.GAMMA + 1)
+
+    def quantiles(self) -> Dict[str, Optional[float]]:
+        """The reported quantiles (p50, p90, p99, p99.9), rounded to 0.01ms."""
+        return {
+            name: round(self.quantile(q), 2)
+            for name, q in REPORTED_QUANTILES.items()
+        } if self.count else {}
+
+    def _collapse(self):
+        # Fold the lowest bins together; the tail quantiles stay accurate
+        keys = sorted(self.bins)
+        excess = keys[:len(keys) - SKETCH_MAX_BINS + 1]
+        target = excess[-1]
+        for key in excess[:-1]:
+            self.bins[target] += self.bins.pop(key)
+
+
+class DurationStats:
+    """Mergeable duration distribution: exact count/sum/min/max plus a quantile sketch."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sketch = QuantileSketch()
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        self.min = duration if self.min is None else min(self.min, duration)
+        self.max = duration if self.max is None else max(self.max, duration)
+        self.sketch.add(duration)
+
+    def merge(self, other: "DurationStats"):
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def mean(self) -> float:
+        return self.total / self.count
+
+    def median(self) -> Optional[float]:
+        if not self.count:
+            return None
+        # Clamp to the exact range (the sketch may lack it for old rollup buckets)
+        return min(max(self.sketch.quantile(0.5), self.min), self.max)
+
+
+class Aggregate:
+    """Counters and duration stats over a set of audit entries."""
+
+    COUNTERS = ("statuses", "actions", "actors", "approvals", "security_levels")
+
+    def __init__(self):
+        self.total = 0
+        self.statuses: Counter = Counter()
+        self.actions: Counter = Counter()
+        self.actors: Counter = Counter()
+        self.approvals: Counter = Counter()
+        self.security_levels: Counter = Counter()
+        self.durations = DurationStats()
+        self.first_timestamp: Optional[str] = None
+        self.last_timestamp: Optional[str] = None
+        self.slow_count = 0
+        self.slowest_action: Optional[str] = None
+        self.slowest_ms: Optional[float] = None
+        self.action_latency: Dict[str, QuantileSketch] = {}
+        self.service_latency: Dict[str, QuantileSketch] = {}
+
+    def add(self, entry: Dict[str, Any]):
+        """Fold one entry into the aggregate."""
+        timestamp = entry["timestamp"]
+        self.total += 1
+        self.statuses[entry.get("status")] += 1
+        self.actions[entry.get("action")] += 1
+        self.actors[entry.get("actor")] += 1
+        self.approvals[entry.get("approval_status")] += 1
+        self.security_levels[entry.get("security_level", "unknown")] += 1
+
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+        duration = entry.get("duration_ms")
+        if duration is not None:
+            self.durations.add(duration)
+            _sketch(self.action_latency, entry.get("action")).add(duration)
+            _sketch(self.service_latency, service_of(entry)).add(duration)
+            if duration > SLOW_OPERATION_MS:
+                self.slow_count += 1
+                if self.slowest_ms is None or duration > self.slowest_ms:
+                    self.slowest_ms = duration
+                    self.slowest_action = entry.get("action")
+
+    def merge(self, other: "Aggregate"):
+        """Fold another aggregate (e.g. an adjacent time bucket) into this one."""
+        self.total += other.total
+        for name in self.COUNTERS:
+            getattr(self, name).update(getattr(other, name))
+        self.durations.merge(other.durations)
+        for name, sketch in other.action_latency.items():
+            _sketch(self.action_latency, name).merge(sketch)
+        for name, sketch in other.service_latency.items():
+            _sketch(self.service_latency, name).merge(sketch)
+
+        if other.first_timestamp and (self.first_timestamp is None or other.first_timestamp < self.first_timestamp):
+            self.first_timestamp = other.first_timestamp
+        if other.last_timestamp and (self.last_timestamp is None or other.last_timestamp > self.last_timestamp):
+            self.last_timestamp = other.last_timestamp
+
+        self.slow_count += other.slow_count
+        if other.slowest_ms is not None and (self.slowest_ms is None or other.slowest_ms > self.slowest_ms):
+            self.slowest_ms = other.slowest_ms
+            self.slowest_action = other.slowest_action
+
+
+def service_of(entry: Dict[str, Any]) -> str:
+    """Service an entry belongs to: the target's scheme (linkedin:123 -> linkedin)."""
+    target = entry.get("target") or ""
+    return target.split(":", 1)[0] if ":" in target else "internal"
+
+
+def _sketch(sketches: Dict[str, QuantileSketch], name: str) -> QuantileSketch:
+    sketch = sketches.get(name)
+    if sketch is None:
+        sketch = sketches[name] = QuantileSketch()
+    return sketch
+
+
+# Rollup tables
+#
+# Aggregates are kept per minute, hour and day bucket, keyed by the matching
+# timestamp prefix (2026-02-09T20:51 / 2026-02-09T20 / 2026-02-09). Counters
+# and latency sketch bins are stored one row per (bucket, dimension, key) and
+# only ever incremented, so concurrent writers never need to read a bucket
+# before updating it.
+
+GRANULARITIES = {"minute": 16, "hour": 13, "day": 10}  # timestamp prefix lengths
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_buckets (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    duration_count INTEGER NOT NULL,
+    duration_total NOT NULL,
+    duration_min,
+    duration_max,
+    first_timestamp TEXT,
+    last_timestamp TEXT,
+    slow_count INTEGER NOT NULL,
+    slowest_ms,
+    slowest_action TEXT,
+    PRIMARY KEY (granularity, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_counts (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    key NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (granularity, bucket, dimension, key)
+) WITHOUT ROWID;
+"""
+
+# Counter dimension name -> Aggregate attribute
+DIMENSIONS = {
+    "status": "statuses",
+    "action": "actions",
+    "actor": "actors",
+    "approval": "approvals",
+    "security": "security_levels"
+}
+
+# Latency sketch dimensions; keys are sketch bins
+LATENCY_ACTION = "latency:action:"
+LATENCY_SERVICE = "latency:service:"
+
+
+def update_rollups(cursor, entries: List[Dict[str, Any]]):
+    """
+    Add entries to every rollup bucket they fall in.
+
+    Runs inside the caller's transaction, so rollups stay exactly in step
+    with whatever the caller inserted.
+    """
+    buckets: Dict[tuple, Aggregate] = {}
+    for entry in entries:
+        timestamp = entry["timestamp"]
+        for granularity, width in GRANULARITIES.items():
+            key = (granularity, timestamp[:width])
+            aggregate = buckets.get(key)
+            if aggregate is None:
+                aggregate = buckets[key] = Aggregate()
+            aggregate.add(entry)
+
+    for (granularity, bucket), aggregate in buckets.items():
+        durations = aggregate.durations
+        cursor.execute(
+            """
+            INSERT INTO rollup_buckets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (granularity, bucket) DO UPDATE SET
+                total = total + excluded.total,
+                duration_count = duration_count + excluded.duration_count,
+                duration_total = duration_total + excluded.duration_total,
+                duration_min = min(coalesce(duration_min, excluded.duration_min), coalesce(excluded.duration_min, duration_min)),
+                duration_max = max(coalesce(duration_max, excluded.duration_max), coalesce(excluded.duration_max, duration_max)),
+                first_timestamp = min(coalesce(first_timestamp, excluded.first_timestamp), excluded.first_timestamp),
+                last_timestamp = max(coalesce(last_timestamp, excluded.last_timestamp), excluded.last_timestamp),
+                slow_count = slow_count + excluded.slow_count,
+                slowest_action = CASE WHEN excluded.slowest_ms > coalesce(slowest_ms, -1)
+                    THEN excluded.slowest_action ELSE slowest_action END,
+                slowest_ms = max(coalesce(slowest_ms, excluded.slowest_ms), coalesce(excluded.slowest_ms, slowest_ms))
+            """,
+            (
+                granularity, bucket, aggregate.total,
+                durations.count, durations.total, durations.min, durations.max,
+                aggregate.first_timestamp, aggregate.last_timestamp,
+                aggregate.slow_count, aggregate.slowest_ms, aggregate.slowest_action
+            )
+        )
+
+        rows = [
+            (granularity, bucket, dimension, _sql_key(key), count)
+            for dimension, attribute in DIMENSIONS.items()
+            for key, count in getattr(aggregate, attribute).items()
+        ]
+        rows += [
+            (granularity, bucket, dimension, key, count)
+            for dimension, sketch in _latency_sketches(aggregate)
+            for key, count in sketch.items()
+        ]
+        cursor.executemany(
+            "INSERT INTO rollup_counts VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (granularity, bucket, dimension, key) DO UPDATE SET count = "
+            f"{_combine_counts('min(count, excluded.count)', 'max(count, excluded.count)', 'count + excluded.count')}",
+            rows
+        )
+
+
+def query_rollups(conn, ranges: List[tuple]) -> Aggregate:
+    """
+    Merge rollup buckets into one aggregate.
+
+    Args:
+        conn: Connection holding the rollup tables
+        ranges: (granularity, first bucket, end bucket or None) triples;
+            buckets are selected with first <= bucket < end
+
+    Returns:
+        Aggregate over every selected bucket
+    """
+    clauses = []
+    params: List[Any] = []
+    for granularity, first, end in ranges:
+        if end is not None and end <= first:
+            continue
+        clause = "(granularity = ? AND bucket >= ?"
+        params += [granularity, first]
+        if end is not None:
+            clause += " AND bucket < ?"
+            params.append(end)
+        clauses.append(clause + ")")
+
+    aggregate = Aggregate()
+    if not clauses:
+        return aggregate
+    where = " OR ".join(clauses)
+
+    row = conn.execute(
+        f"""
+        SELECT sum(total), sum(duration_count), sum(duration_total), min(duration_min), max(duration_max),
+               min(first_timestamp), max(last_timestamp), sum(slow_count), max(slowest_ms)
+        FROM rollup_buckets WHERE {where}
+        """,
+        params
+    ).fetchone()
+    if not row[0]:
+        return aggregate
+
+    durations = aggregate.durations
+    (aggregate.total, durations.count, durations.total, durations.min, durations.max,
+     aggregate.first_timestamp, aggregate.last_timestamp, aggregate.slow_count, aggregate.slowest_ms) = row
+    if aggregate.slowest_ms is not None:
+        aggregate.slowest_action = conn.execute(
+            f"SELECT slowest_action FROM rollup_buckets WHERE ({where}) AND slowest_ms = ? LIMIT 1",
+            params + [aggregate.slowest_ms]
+        ).fetchone()[0]
+
+    for dimension, key, count in conn.execute(
+        f"SELECT dimension, key, {_combine_counts('min(count)', 'max(count)', 'sum(count)')} "
+        f"FROM rollup_counts WHERE {where} GROUP BY dimension, key",
+        params
+    ):
+        if dimension == "latency":
+            durations.sketch.add_bin(key, count)
+        elif dimension.startswith(LATENCY_ACTION):
+            _sketch(aggregate.action_latency, dimension[len(LATENCY_ACTION):]).add_bin(key, count)
+        elif dimension.startswith(LATENCY_SERVICE):
+            _sketch(aggregate.service_latency, dimension[len(LATENCY_SERVICE):]).add_bin(key, count)
+        elif dimension in DIMENSIONS:
+            getattr(aggregate, DIMENSIONS[dimension])[_python_key(key)] = count
+
+    return aggregate
+
+
+def _latency_sketches(aggregate: Aggregate):
+    """(dimension, sketch) pairs stored for an aggregate."""
+    yield "latency", aggregate.durations.sketch
+    for action, sketch in aggregate.action_latency.items():
+        yield LATENCY_ACTION + str(action), sketch
+    for service, sketch in aggregate.service_latency.items():
+        yield LATENCY_SERVICE + service, sketch
+
+
+def drop_rollups_before(cursor, day: str):
+    """Delete every rollup bucket older than a day (YYYY-MM-DD)."""
+    for granularity in GRANULARITIES:
+        cursor.execute("DELETE FROM rollup_buckets WHERE granularity = ? AND bucket < ?", (granularity, day))
+        cursor.execute("DELETE FROM rollup_counts WHERE granularity = ? AND bucket < ?", (granularity, day))
+
+
+def _combine_counts(smallest: str, largest: str, total: str) -> str:
+    """
+    SQL picking how rollup_counts values combine: sketch min rows keep the
+    smallest value, sketch max rows the largest, every other row adds up.
+    """
+    return (
+        f"CASE WHEN dimension LIKE 'latency%' AND key = '{MIN_KEY}' THEN {smallest} "
+        f"WHEN dimension LIKE 'latency%' AND key = '{MAX_KEY}' THEN {largest} "
+        f"ELSE {total} END"
+    )
+
+
+def _sql_key(key):
+    # NULLs never collide in a primary key, so store missing values as ''
+    return "" if key is None else key
+
+
+def _python_key(key):
+    return None if key == "" else key
@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Segmented Audit Log Store
+
+Append-only storage engine behind AuditLogger:
+- Compact newline-delimited JSON records
+- One partition directory per day, segments rotated by size
+- Group-commit buffer shared by every logger in the process
+- Configurable durability (async, sync, fsync)
+- Commit hooks for secondary structures (see audit_index.py)
+- Retention by whole day partitions, gzip/zstd compaction of closed days
+- One-shot migration of legacy one-file-per-entry logs
+
+Layout:
+    audit/segments/2026-02-09/segment-0001.jsonl
+    audit/segments/2026-01-30/segment-0001.jsonl.gz   (compacted)
+
+Gold Tier Feature #3
+"""
+
+import atexit
+import gzip
+import io
+import json
+import os
+import shutil
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Callable
+
+try:
+    import zstandard
+except ImportError:
+    # zstd compaction is optional; gzip is always available
+    zstandard = None
+
+# (segment path, byte offset, byte length, entry) for one committed record
+Record = Tuple[Path, int, int, Dict[str, Any]]
+
+# Configuration
+SEGMENTS_DIRNAME = "segments"
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+GROUP_COMMIT_MAX_RECORDS = 256
+GROUP_COMMIT_MAX_DELAY = 0.2  # seconds
+
+# async: buffered, written by the next group commit (at most GROUP_COMMIT_MAX_DELAY later)
+# sync:  written to the OS before log() returns
+# fsync: written and fsynced before log() returns
+DURABILITY_MODES = ("async", "sync", "fsync")
+DEFAULT_DURABILITY = "async"
+
+# Compressed segment suffixes by codec
+CODEC_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class SegmentStore:
+    """Append-only, day-partitioned store of newline-delimited audit records."""
+
+    def __init__(
+        self,
+        root: Path,
+        max_segment_bytes: int = SEGMENT_MAX_BYTES,
+        max_batch_records: int = GROUP_COMMIT_MAX_RECORDS,
+        max_batch_delay: float = GROUP_COMMIT_MAX_DELAY
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            root: Audit directory; segments live under root/segments
+            max_segment_bytes: Rotate to a new segment past this size
+            max_batch_records: Commit the buffer once it holds this many records
+            max_batch_delay: Longest time an async record waits in the buffer
+        """
+        self.root = Path(root)
+        self.segments_dir = self.root / SEGMENTS_DIRNAME
+        self.max_segment_bytes = max_segment_bytes
+        self.max_batch_records = max_batch_records
+        self.max_batch_delay = max_batch_delay
+
+        # _lock guards the buffer and routing state; _commit_lock serializes
+        # writes, and whoever holds it commits everything buffered so far.
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._buffer: List[Tuple[Path, bytes, bool, Dict[str, Any]]] = []
+        self._appended = 0
+        self._committed = 0
+        self._active: Dict[str, List] = {}  # day -> [segment path, seq, size]
+        self._known_dirs = set()
+        self._timer: Optional[threading.Timer] = None
+        self._commit_hooks: List[Callable[[List[Record]], None]] = []
+
+    def add_commit_hook(self, hook: Callable[[List[Record]], None]):
+        """Call hook(records) after every committed batch, in commit order."""
+        self._commit_hooks.append(hook)
+
+    # Writing
+
+    def append(self, entry: Dict[str, Any], durability: str = DEFAULT_DURABILITY) -> str:
+        """
+        Append one record.
+
+        Args:
+            entry: Log entry; must carry an ISO8601 "timestamp"
+            durability: One of DURABILITY_MODES
+
+        Returns:
+            Path of the segment the record is written to
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+
+        line = (json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+        with self._lock:
+            path = self._route(entry["timestamp"][:10], len(line))
+            self._buffer.append((path, line, durability == "fsync", entry))
+            self._appended += 1
+            seq = self._appended
+            pending = len(self._buffer)
+            if durability == "async" and pending < self.max_batch_records and self._timer is None:
+                self._timer = threading.Timer(self.max_batch_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if durability != "async" or pending >= self.max_batch_records:
+            self._commit(upto=seq)
+
+        return str(path)
+
+    def flush(self, fsync: bool = False):
+        """Commit every buffered record."""
+        self._commit(fsync=fsync)
+
+    def _route(self, day: str, size: int) -> Path:
+        """Pick the segment for a record, rotating when the active one is full."""
+        active = self._active.get(day)
+        if active is None:
+            active = self._load_active(day)
+            self._active[day] = active
+
+        if active[2] and active[2] + size > self.max_segment_bytes:
+            active[1] += 1
+            active[0] = self._segment_path(day, active[1])
+            active[2] = 0
+
+        active[2] += size
+        return active[0]
+
+    def _load_active(self, day: str) -> List:
+        """Resume the newest segment of a day partition (possibly written by another process)."""
+        segments = self._segments(self.segments_dir / day)
+        if not segments:
+            return [self._segment_path(day, 1), 1, 0]
+
+        last = segments[-1]
+        seq = _segment_seq(last)
+        if last.suffix != SEGMENT_SUFFIX:
+            # Newest segment is closed (e.g. compressed), start a fresh one
+            return [self._segment_path(day, seq + 1), seq + 1, 0]
+        return [last, seq, last.stat().st_size]
+
+    def _segment_path(self, day: str, seq: int) -> Path:
+        return self.segments_dir / day / f"{SEGMENT_PREFIX}{seq:04d}{SEGMENT_SUFFIX}"
+
+    def _commit(self, upto: Optional[int] = None, fsync: bool = False):
+        """Write out the buffer. Concurrent callers share a single write (group commit)."""
+        with self._commit_lock:
+            if upto is not None and self._committed >= upto:
+                return  # An earlier leader already wrote our record
+
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+                last = self._appended
+                timer, self._timer = self._timer, None
+
+            if timer is not None:
+                timer.cancel()
+
+            if batch:
+                self._write_batch(batch, fsync)
+            self._committed = last
+
+    def _write_batch(self, batch: List[Tuple[Path, bytes, bool, Dict[str, Any]]], fsync: bool):
+        """Append a batch, one write per segment, then run commit hooks."""
+        grouped: Dict[Path, List[Tuple[bytes, Dict[str, Any]]]] = {}
+        for path, line, needs_fsync, entry in batch:
+            grouped.setdefault(path, []).append((line, entry))
+            fsync = fsync or needs_fsync
+
+        records: List[Record] = []
+        for path, items in grouped.items():
+            offset = self._write_segment(path, b"".join(line for line, _ in items), fsync)
+            for line, entry in items:
+                records.append((path, offset, len(line), entry))
+                offset += len(line)
+
+        for hook in self._commit_hooks:
+            try:
+                hook(records)
+            except Exception as e:
+                print(f"Error in audit commit hook: {e}")
+
+    def _write_segment(self, path: Path, data: bytes, fsync: bool) -> int:
+        """Append raw bytes to a segment and return the offset they start at."""
+        created = False
+        if path.parent not in self._known_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(path.parent)
+            created = True
+
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            if fsync:
+                os.fsync(fd)
+            end = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+
+        if fsync and created:
+            _fsync_dir(path.parent)
+
+        return end - len(data)
+
+    # Reading
+
+    def days(self) -> List[str]:
+        """List day partitions, oldest first."""
+        if not self.segments_dir.exists():
+            return []
+        return sorted(
+            d.name for d in self.segments_dir.iterdir()
+            if d.is_dir() and len(d.name) == 10 and d.name[4] == "-"
+        )
+
+    def segments(self) -> List[Path]:
+        """List every segment, oldest first."""
+        return [
+            segment
+            for day in self.days()
+            for segment in self._segments(self.segments_dir / day)
+        ]
+
+    def _segments(self, day_dir: Path) -> List[Path]:
+        """List the segments of a day partition in write order."""
+        if not day_dir.exists():
+            return []
+
+        names = {p.name for p in day_dir.iterdir()}
+        segments = []
+        for name in names:
+            if not name.startswith(SEGMENT_PREFIX) or name.endswith(".tmp"):
+                continue
+            if name.endswith(SEGMENT_SUFFIX) and any(name + suffix in names for suffix in CODEC_SUFFIXES.values()):
+                continue  # Superseded by its compacted copy (interrupted compaction)
+            segments.append(day_dir / name)
+
+        return sorted(segments, key=_segment_seq)
+
+    def iter_entries(self, start_day: Optional[str] = None, end_day: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream entries from the store, partition by partition.
+
+        Args:
+            start_day: First day partition to read (YYYY-MM-DD), inclusive
+            end_day: Last day partition to read (YYYY-MM-DD), inclusive
+
+        Yields:
+            Log entries in write order within each day
+        """
+        self.flush()
+
+        for day in self.days():
+            if start_day and day < start_day:
+                continue
+            if end_day and day > end_day:
+                break
+            for segment in self._segments(self.segments_dir / day):
+                yield from self._read_segment(segment)
+
+    def _open_segment(self, segment: Path):
+        """Open a segment for reading, transparently decompressing closed ones."""
+        if segment.suffix == CODEC_SUFFIXES["gzip"]:
+            return gzip.open(segment, "rb")
+        if segment.suffix == CODEC_SUFFIXES["zstd"]:
+            if zstandard is None:
+                raise RuntimeError(f"Reading {segment} requires the 'zstandard' package")
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(segment, "rb"), closefd=True))
+        return open(segment, "rb")
+
+    def _read_segment(self, segment: Path) -> Iterator[Dict[str, Any]]:
+        for _, _, entry in self.read_records(segment):
+            yield entry
+
+    def read_records(self, segment: Path, start: int = 0) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Stream (offset, length, entry) for each complete record of a segment.
+
+        Args:
+            segment: Segment file
+            start: Byte offset to resume from (must be a record boundary)
+        """
+        with self._open_segment(segment) as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn tail from an interrupted write
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if entry is not None:
+                    yield offset, len(line), entry
+                offset += len(line)
+
+    def read_at(self, segment: Path, spans: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """
+        Read records at known (offset, length) positions of one segment.
+
+        Args:
+            segment: Segment file
+            spans: Record positions, e.g. from the audit index
+
+        Returns:
+            Entries in ascending offset order
+        """
+        entries = []
+        with self._open_segment(segment) as f:
+            for offset, length in sorted(spans):
+                f.seek(offset)
+                entries.append(json.loads(f.read(length)))
+        return entries
+
+    # Retention
+
+    def drop_partitions_before(self, day: str) -> List[str]:
+        """
+        Remove whole day partitions older than a day.
+
+        Args:
+            day: First day to keep (YYYY-MM-DD)
+
+        Returns:
+            Days removed
+        """
+        self.flush()
+
+        dropped = [d for d in self.days() if d < day]
+        for d in dropped:
+            shutil.rmtree(self.segments_dir / d)
+            with self._lock:
+                self._active.pop(d, None)
+            self._known_dirs.discard(self.segments_dir / d)
+
+        return dropped
+
+    def compact_partitions_before(
+        self,
+        day: str,
+        codec: str = "gzip",
+        on_compacted: Optional[Callable[[Path, Path], None]] = None
+    ) -> int:
+        """
+        Compress the open segments of closed day partitions.
+
+        Offsets inside a compressed segment refer to the decompressed stream,
+        so positions recorded by the index stay valid.
+
+        Args:
+            day: Compact partitions strictly before this day (YYYY-MM-DD)
+            codec: "gzip" or "zstd" (requires the zstandard package)
+            on_compacted: Called with (old path, new path) before the original is removed
+
+        Returns:
+            Number of segments compressed
+        """
+        if codec not in CODEC_SUFFIXES:
+            raise ValueError(f"Unknown compression codec: {codec}")
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("zstd compaction requires the 'zstandard' package")
+
+        self.flush()
+
+        # Never compact today's partition; it is still being appended to
+        day = min(day, datetime.now().strftime("%Y-%m-%d"))
+        compacted = 0
+
+        for d in self.days():
+            if d >= day:
+                break
+
+            with self._lock:
+                self._active.pop(d, None)
+
+            open_segments = (self.segments_dir / d).glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+            for segment in sorted(open_segments, key=_segment_seq):
+                existing = [
+                    segment.with_name(segment.name + suffix) for suffix in CODEC_SUFFIXES.values()
+                    if segment.with_name(segment.name + suffix).exists()
+                ]
+                if existing:
+                    compressed = existing[0]  # Finish an interrupted compaction
+                else:
+                    compressed = segment.with_name(segment.name + CODEC_SUFFIXES[codec])
+                    self._compress(segment, compressed, codec)
+                    compacted += 1
+                if on_compacted:
+                    on_compacted(segment, compressed)
+                segment.unlink()
+
+        return compacted
+
+    def _compress(self, source: Path, destination: Path, codec: str):
+        """Write a compressed copy via a temp file, so readers never see a partial segment."""
+        tmp = destination.with_name(destination.name + ".tmp")
+
+        with open(source, "rb") as src, open(tmp, "wb") as raw:
+            if codec == "gzip":
+                with gzip.GzipFile(fileobj=raw, mode="wb") as dst:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+            else:
+                with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as dst:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        os.replace(tmp, destination)
+
+
+def _segment_seq(path: Path) -> int:
+    """Sequence number of a segment file (segment-0007.jsonl -> 7)."""
+    return int(path.name[len(SEGMENT_PREFIX):].split(".", 1)[0])
+
+
+def _fsync_file(path: Path):
+    """Flush a file's data to disk."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(directory: Path):
+    """Persist a directory entry (new segment) on POSIX systems."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# One store per audit directory, shared by every AuditLogger in the process
+_stores: Dict[Path, SegmentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(root: Path) -> SegmentStore:
+    """Get or create the shared store for an audit directory."""
+    root = Path(root).resolve()
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = SegmentStore(root)
+            _stores[root] = store
+        return store
+
+
+@atexit.register
+def _flush_all_stores():
+    """Commit buffered records on interpreter exit."""
+    for store in list(_stores.values()):
+        try:
+            store.flush()
+        except Exception as e:
+            print(f"Error flushing audit store {store.root}: {e}")
+
+
+def _entry_identity(entry: Dict[str, Any]) -> str:
+    """The entry's full content in canonical form."""
+    return json.dumps(entry, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def migrate_legacy_logs(store: SegmentStore, legacy_dir: Path, exclude: Tuple[str, ...] = ("audit_schema.json",)) -> int:
+    """
+    Fold legacy one-file-per-entry JSON logs into segments.
+
+    Entries are appended in timestamp order, fsynced, and only then are the
+    original files removed. An interrupted migration can simply be rerun:
+    entries already in the store (appended before a crash, with their files
+    not yet removed) are skipped rather than appended again.
+
+    Args:
+        store: Destination store
+        legacy_dir: Directory holding the legacy *.json entries
+        exclude: File names that are not log entries
+
+    Returns:
+        Number of entries migrated (including ones found already stored)
+    """
+    migrated = []
+    for log_file in Path(legacy_dir).glob("*.json"):
+        if log_file.name in exclude:
+            continue
+
+        try:
+            with open(log_file, 'r') as f:
+                entry = json.load(f)
+            entry["timestamp"]
+        except Exception as e:
+            print(f"Skipping {log_file}: {e}")
+            continue
+
+        migrated.append((entry, log_file))
+
+    migrated.sort(key=lambda item: item[0]["timestamp"])
+
+    # A multiset, so identical legacy entries are each migrated once
+    stored = Counter()
+    if migrated:
+        stored.update(
+            _entry_identity(entry)
+            for entry in store.iter_entries(migrated[0][0]["timestamp"][:10], migrated[-1][0]["timestamp"][:10])
+        )
+
+    touched = set()
+    for entry, _ in migrated:
+        identity = _entry_identity(entry)
+        if stored[identity]:
+            stored[identity] -= 1  # Appended by an interrupted run
+            continue
+        touched.add(Path(store.append(entry, durability="async")))
+    store.flush()
+
+    # Group commits along the way were not fsynced: persist every segment
+    # written to (and the new partition directories) before deleting anything
+    for segment in touched:
+        _fsync_file(segment)
+    for directory in {segment.parent for segment in touched}:
+        _fsync_dir(directory)
+    if touched:
+        _fsync_dir(store.segments_dir)
+
+    for _, log_file in migrated:
+        log_file.unlink()
+
+    return len(migrated)
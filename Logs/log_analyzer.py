@@ -14,12 +14,21 @@ Features:
 Gold Tier Feature #3
 """
 
+import itertools
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict, Counter
-from typing import Dict, List, Any
-import statistics
+from typing import Dict, List, Any, Iterator
+
+try:
+    from .audit_store import get_store
+    from .audit_index import get_index
+    from .audit_rollup import Aggregate
+except ImportError:
+    # Running as a script from the Logs directory
+    from audit_store import get_store
+    from audit_index import get_index
+    from audit_rollup import Aggregate
 
 
 AUDIT_DIR = Path(__file__).parent / "audit"
@@ -29,25 +38,47 @@ class LogAnalyzer:
     """Analyze audit logs for insights and patterns."""
 
     def __init__(self):
-        self.logs = self._load_all_logs()
-
-    def _load_all_logs(self) -> List[Dict]:
-        """Load all audit logs from the audit directory."""
-        logs = []
-        if not AUDIT_DIR.exists():
-            return logs
-
-        for log_file in AUDIT_DIR.glob("*.json"):
-            if log_file.name == "audit_schema.json":
-                continue
-
-            try:
-                with open(log_file, 'r') as f:
-                    logs.append(json.load(f))
-            except Exception as e:
-                print(f"Error loading {log_file}: {e}")
+        # Nothing is read here; queries go to the rollup buckets
+        self.store = get_store(AUDIT_DIR)
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = get_index(self.store)
+        return self._index
+
+    def _iter_window(self, start: datetime, end: datetime) -> Iterator[Dict]:
+        """Stream raw entries with start <= timestamp < end."""
+        for entry in self.index.iter_query(start_date=start, end_date=end, descending=False):
+            if entry["timestamp"] < end.isoformat():
+                yield entry
+
+    def _aggregate(self, hours: int) -> Aggregate:
+        """
+        Aggregate the last N hours from rollup buckets.
 
-        return sorted(logs, key=lambda x: x["timestamp"])
+        The window is covered by at most one minute of raw entries, then
+        minute buckets up to the next hour, hour buckets up to the next day
+        and day buckets from there on. Nothing is logged after now, so the
+        trailing buckets need no alignment.
+        """
+        cutoff = datetime.now() - timedelta(hours=hours)
+        next_minute = _ceil(cutoff, timedelta(minutes=1))
+        next_hour = _ceil(cutoff, timedelta(hours=1))
+        next_day = _ceil(cutoff, timedelta(days=1))
+
+        aggregate = Aggregate()
+        if AUDIT_DIR.exists():
+            for entry in self._iter_window(cutoff, next_minute):
+                aggregate.add(entry)
+            aggregate.merge(self.index.rollup([
+                ("minute", next_minute.isoformat()[:16], next_hour.isoformat()[:16]),
+                ("hour", next_hour.isoformat()[:13], next_day.isoformat()[:13]),
+                ("day", next_day.isoformat()[:10], None)
+            ]))
+
+        return aggregate
 
     def generate_summary(self, hours: int = 24) -> Dict[str, Any]:
         """
@@ -59,77 +90,92 @@ class LogAnalyzer:
         Returns:
             Dictionary with summary statistics
         """
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_logs = [
-            log for log in self.logs
-            if datetime.fromisoformat(log["timestamp"]) >= cutoff_time
-        ]
+        window = self._aggregate(hours)
 
-        if not recent_logs:
+        if not window.total:
             return {"message": "No logs in specified time period"}
 
         # Calculate statistics
-        total_actions = len(recent_logs)
-        success_count = sum(1 for log in recent_logs if log["status"] == "success")
-        failure_count = sum(1 for log in recent_logs if log["status"] == "failure")
-        pending_count = sum(1 for log in recent_logs if log["status"] == "pending")
-
-        # Action type breakdown
-        action_counts = Counter(log["action"] for log in recent_logs)
-
-        # Actor breakdown
-        actor_counts = Counter(log["actor"] for log in recent_logs)
-
-        # Approval workflow stats
-        approval_stats = {
-            "approved": sum(1 for log in recent_logs if log.get("approval_status") == "approved"),
-            "rejected": sum(1 for log in recent_logs if log.get("approval_status") == "rejected"),
-            "pending": sum(1 for log in recent_logs if log.get("approval_status") == "pending"),
-            "not_required": sum(1 for log in recent_logs if log.get("approval_status") == "not_required")
-        }
+        total_actions = window.total
+        success_count = window.statuses["success"]
 
         # Performance metrics (if duration_ms available)
-        durations = [log.get("duration_ms") for log in recent_logs if log.get("duration_ms")]
+        durations = window.durations
         perf_stats = {}
-        if durations:
+        if durations.count:
             perf_stats = {
-                "avg_duration_ms": statistics.mean(durations),
-                "median_duration_ms": statistics.median(durations),
-                "max_duration_ms": max(durations),
-                "min_duration_ms": min(durations)
+                "avg_duration_ms": durations.mean(),
+                "median_duration_ms": durations.median(),
+                "max_duration_ms": durations.max,
+                "min_duration_ms": durations.min,
+                "percentiles_ms": durations.sketch.quantiles(),
+                "by_action": _latency_table(window.action_latency),
+                "by_service": _latency_table(window.service_latency)
             }
 
-        # Security level breakdown
-        security_counts = Counter(log.get("security_level", "unknown") for log in recent_logs)
-
         return {
             "period": f"Last {hours} hours",
             "total_actions": total_actions,
             "success_rate": f"{(success_count/total_actions*100):.1f}%" if total_actions > 0 else "N/A",
             "status_breakdown": {
                 "success": success_count,
-                "failure": failure_count,
-                "pending": pending_count
+                "failure": window.statuses["failure"],
+                "pending": window.statuses["pending"]
+            },
+            "actions": dict(window.actions.most_common(10)),
+            "actors": dict(window.actors),
+            "approval_workflow": {
+                status: window.approvals[status]
+                for status in ("approved", "rejected", "pending", "not_required")
             },
-            "actions": dict(action_counts.most_common(10)),
-            "actors": dict(actor_counts),
-            "approval_workflow": approval_stats,
             "performance": perf_stats,
-            "security_levels": dict(security_counts),
+            "security_levels": dict(window.security_levels),
             "time_range": {
-                "start": recent_logs[0]["timestamp"] if recent_logs else None,
-                "end": recent_logs[-1]["timestamp"] if recent_logs else None
+                "start": window.first_timestamp,
+                "end": window.last_timestamp
             }
         }
 
+    def circuit_breakers(self, hours: int = 24) -> Dict[str, Dict[str, Any]]:
+        """
+        Circuit breaker activity per service (from orchestrator audit entries).
+
+        Args:
+            hours: Time window for counting trips
+
+        Returns:
+            Dictionary of service -> current state, last change and trips in window
+        """
+        if not AUDIT_DIR.exists():
+            return {}
+
+        cutoff = datetime.now() - timedelta(hours=hours)
+        services: Dict[str, Dict[str, Any]] = {}
+
+        # Newest first: the first entry seen per service is its current state.
+        # Services quiet during the window keep their last earlier change.
+        in_window = self.index.iter_query(action="circuit_breaker", start_date=cutoff)
+        earlier = self.index.latest_per_target("circuit_breaker", cutoff)
+        for entry in itertools.chain(in_window, earlier):
+            service = entry.get("details", {}).get("service") or entry["target"].split(":", 1)[0]
+            info = services.setdefault(service, {
+                "state": entry["status"],
+                "since": entry["timestamp"],
+                "opened": 0
+            })
+            if entry["status"] == "open" and entry["timestamp"] >= cutoff.isoformat():
+                info["opened"] += 1
+
+        return services
+
     def detect_anomalies(self) -> List[Dict[str, Any]]:
         """Detect unusual patterns or security issues."""
         anomalies = []
 
         # Check for unusual failure rates
-        recent_logs = self._get_recent_logs(hours=1)
-        if len(recent_logs) > 10:
-            failure_rate = sum(1 for log in recent_logs if log["status"] == "failure") / len(recent_logs)
+        recent = self._aggregate(hours=1)
+        if recent.total > 10:
+            failure_rate = recent.statuses["failure"] / recent.total
             if failure_rate > 0.3:  # More than 30% failures
                 anomalies.append({
                     "type": "high_failure_rate",
@@ -139,8 +185,12 @@ class LogAnalyzer:
                 })
 
         # Check for security events
-        security_events = [log for log in recent_logs if log.get("action", "").startswith("security_")]
-        if security_events:
+        if any(action and action.startswith("security_") for action in recent.actions):
+            security_events = self.index.query(
+                action="security_",
+                start_date=datetime.now() - timedelta(hours=1),
+                descending=False
+            )
             anomalies.append({
                 "type": "security_events",
                 "severity": "alert",
@@ -150,42 +200,40 @@ class LogAnalyzer:
             })
 
         # Check for rejected approvals
-        recent_rejections = [
-            log for log in recent_logs
-            if log.get("approval_status") == "rejected"
-        ]
-        if recent_rejections:
+        if recent.approvals["rejected"]:
             anomalies.append({
                 "type": "rejected_approvals",
                 "severity": "info",
-                "message": f"{len(recent_rejections)} actions were rejected",
+                "message": f"{recent.approvals['rejected']} actions were rejected",
                 "recommendation": "Review rejection reasons to improve autonomous decision-making"
             })
 
+        # Check for open circuit breakers
+        tripped = {
+            service: info for service, info in self.circuit_breakers(hours=1).items()
+            if info["state"] != "closed"
+        }
+        if tripped:
+            anomalies.append({
+                "type": "circuit_open",
+                "severity": "warning",
+                "message": f"Circuit breaker not closed for: {', '.join(sorted(tripped))}",
+                "services": tripped,
+                "recommendation": "Check the affected services; their actions are failing fast"
+            })
+
         # Check for slow operations
-        slow_ops = [
-            log for log in recent_logs
-            if log.get("duration_ms") and log.get("duration_ms") > 5000  # Slower than 5 seconds
-        ]
-        if slow_ops:
+        if recent.slow_count:
             anomalies.append({
                 "type": "slow_operations",
                 "severity": "warning",
-                "message": f"{len(slow_ops)} slow operations detected",
-                "slowest": max(slow_ops, key=lambda x: x.get("duration_ms", 0))["action"],
+                "message": f"{recent.slow_count} slow operations detected",
+                "slowest": recent.slowest_action,
                 "recommendation": "Investigate performance bottlenecks"
             })
 
         return anomalies
 
-    def _get_recent_logs(self, hours: int = 24) -> List[Dict]:
-        """Get logs from the last N hours."""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        return [
-            log for log in self.logs
-            if datetime.fromisoformat(log["timestamp"]) >= cutoff_time
-        ]
-
     def generate_report(self, output_file: str = None) -> str:
         """
         Generate comprehensive analysis report.
@@ -202,7 +250,7 @@ class LogAnalyzer:
 
         report = f"""# Audit Log Analysis Report
 **Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**Total Logs Analyzed**: {len(self.logs)}
+**Total Logs Analyzed**: {self.index.count()}
 
 ---
 
@@ -241,8 +289,30 @@ class LogAnalyzer:
 - Median Duration: {perf.get('median_duration_ms', 0):.0f}ms
 - Fastest: {perf.get('min_duration_ms', 0):.0f}ms
 - Slowest: {perf.get('max_duration_ms', 0):.0f}ms
-
 """
+            percentiles = perf.get('percentiles_ms', {})
+            if percentiles:
+                report += (
+                    f"- p90 / p99 / p99.9: {percentiles['p90']:.0f}ms / "
+                    f"{percentiles['p99']:.0f}ms / {percentiles['p99_9']:.0f}ms\n"
+                )
+
+            for title, table in (("Action", perf.get('by_action', {})), ("Service", perf.get('by_service', {}))):
+                report += f"\n| {title} | Count | p50 | p90 | p99 | p99.9 |\n|---|---|---|---|---|---|\n"
+                for name, stats in list(table.items())[:10]:
+                    report += (
+                        f"| {name} | {stats['count']} | {stats['p50']:.0f}ms | {stats['p90']:.0f}ms | "
+                        f"{stats['p99']:.0f}ms | {stats['p99_9']:.0f}ms |\n"
+                    )
+            report += "\n"
+
+        # Circuit breakers
+        breakers = self.circuit_breakers(hours=24)
+        if breakers:
+            report += "### Circuit Breakers\n\n| Service | State | Since | Trips (24h) |\n|---|---|---|---|\n"
+            for service, info in sorted(breakers.items()):
+                report += f"| {service} | {info['state']} | {info['since'][:19]} | {info['opened']} |\n"
+            report += "\n"
 
         # 7-day trends
         report += f"""---
@@ -312,6 +382,20 @@ class LogAnalyzer:
         return report
 
 
+def _latency_table(sketches: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Count and percentiles per action/service, busiest first."""
+    return {
+        name: {"count": sketch.count, **sketch.quantiles()}
+        for name, sketch in sorted(sketches.items(), key=lambda item: -item[1].count)
+    }
+
+
+def _ceil(moment: datetime, step: timedelta) -> datetime:
+    """Round a timestamp up to the next multiple of step (minute, hour or day)."""
+    floor = datetime.min + ((moment - datetime.min) // step) * step
+    return floor if floor == moment else floor + step
+
+
 def main():
     """Command-line interface for log analyzer."""
     import sys
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Vault File Helpers
+
+Collision-free IDs and atomic file writes shared by the audit logger and the
+integration orchestrator.
+
+IDs look like 2026-02-09_203015_123456_4242_3f9a1c07: the local time to the
+microsecond, the process ID, then a random per-process tag. Within a process
+the time part is strictly increasing (bumped by a microsecond when the clock
+repeats or steps back), so its IDs never collide and sort in creation order.
+Processes running at the same time on one machine differ by PID; the 32-bit
+tag separates machines writing to a synced vault, where a collision is
+unlikely but not impossible.
+
+Gold Tier Feature #3
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Union
+
+_id_lock = threading.Lock()
+_last_moment = datetime.min
+_process_tag = f"{os.getpid()}_{os.urandom(4).hex()}"
+
+
+def _new_process_tag():
+    """Give a forked child its own tag so parent and child cannot collide."""
+    global _process_tag
+    _process_tag = f"{os.getpid()}_{os.urandom(4).hex()}"
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_new_process_tag)
+
+
+def new_id() -> str:
+    """
+    Generate a unique, time-ordered ID for file names and log entries.
+
+    Returns:
+        ID string (safe for file names)
+    """
+    global _last_moment
+    with _id_lock:
+        moment = datetime.now()
+        if moment <= _last_moment:
+            moment = _last_moment + timedelta(microseconds=1)
+        _last_moment = moment
+
+    return f"{moment.strftime('%Y-%m-%d_%H%M%S_%f')}_{_process_tag}"
+
+
+def atomic_write(path: Union[str, Path], content: Union[str, bytes], fsync: bool = False,
+                 tmp_dir: Optional[Union[str, Path]] = None):
+    """
+    Write a file via a temporary file and rename it into place.
+
+    Readers (watchers, the user) see either no file or the complete file,
+    never a partial one. The temporary name is hidden and ends in ".tmp".
+
+    Args:
+        path: Destination file
+        content: Text (written as UTF-8) or bytes
+        fsync: Flush to disk before the rename (for files that must survive
+            a power loss, e.g. state files)
+        tmp_dir: Write the temporary file here instead of next to path (must
+            be on the same filesystem). Use it for files landing in a watched
+            folder: the watcher then sees only the finished file arrive, as a
+            new file, rather than a temporary one being created and renamed.
+    """
+    path = Path(path)
+    tmp_name = f".{path.name}.{new_id()}.tmp"
+    tmp = Path(tmp_dir) / tmp_name if tmp_dir is not None else path.with_name(tmp_name)
+    data = content.encode("utf-8") if isinstance(content, str) else content
+
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
@@ -1,76 +1,695 @@
+import os
+import sys
 import time
+import errno
+import hashlib
+import sqlite3
 import shutil
+import queue
+import argparse
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 
+try:
+    import fcntl
+except ImportError:
+    # Unavailable on Windows; there are no reflinks there and drops are copied
+    fcntl = None
+
 VAULT_PATH = Path.cwd()
 INBOX_PATH = VAULT_PATH / "Inbox"
 NEEDS_ACTION_PATH = VAULT_PATH / "Needs_Action"
+DONE_PATH = VAULT_PATH / "Done"
+DROP_INDEX_PATH = VAULT_PATH / "Logs" / "drop_index.sqlite3"
+
+# auto: inotify on Linux unless the Inbox is on a filesystem that does not
+# deliver inotify events (network and WSL Windows-drive mounts), else polling
+OBSERVER_MODES = ("auto", "inotify", "polling")
+POLL_INTERVAL = 3
+
+# Filesystems where changes made by other machines (or by Windows, for WSL's
+# /mnt/<drive> mounts) never reach inotify
+NO_INOTIFY_FSTYPES = {
+    "9p", "drvfs", "nfs", "nfs4", "cifs", "smb3", "smbfs",
+    "fuse.sshfs", "fuse.rclone", "fuse.s3fs", "afs", "ceph"
+}
+
+# A dropped file is complete when its writer closes it (inotify) or, where
+# close events are unavailable, once its size and mtime have not changed for
+# SETTLE_QUIET_SECONDS (checked every SETTLE_CHECK_INTERVAL seconds)
+SETTLE_QUIET_SECONDS = 1.0
+SETTLE_CHECK_INTERVAL = 0.2
+
+# Names writers use while a file is still being written (renamed into place
+# when done, e.g. atomic writes and browser downloads); never ingested
+TEMPORARY_SUFFIXES = (".tmp", ".crdownload", ".part")
+
+# Ingest pipeline: threads per stage, and drops waiting in front of each
+# stage before the stage feeding it blocks (backpressure)
+COPY_WORKERS = 4
+METADATA_WORKERS = 2
+PIPELINE_QUEUE_SIZE = 64
+
+# How a drop gets into Needs_Action:
+#   auto      reflink (shared extents, copy-on-write) where the filesystem
+#             supports it, else an in-kernel copy; the result is always an
+#             independent copy, like "copy"
+#   copy      in-kernel copy (copy_file_range, else sendfile)
+#   reflink   same as auto
+#   hardlink  second name for the same file (no data written; edits to
+#             either name show in both), else a copy
+#   move      rename out of Inbox (no data written), else copy and delete
+INGEST_MODES = ("auto", "copy", "reflink", "hardlink", "move")
+COPY_CHUNK = 64 * 1024 * 1024
+
+# Content already dropped within this many days is linked to the existing
+# action item instead of creating a new one (0 turns deduplication off)
+DEDUPE_WINDOW_DAYS = 30
+HASH_CHUNK = 1024 * 1024
+DUPLICATES_HEADING = "\n## Duplicate Drops\n"
+
+# ioctl(dest_fd, FICLONE, src_fd) from <linux/fs.h>
+FICLONE = 0x40049409
+
+# Errors meaning "this fast path is not possible here", not "the copy failed"
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL,
+    errno.ENOSYS, errno.EPERM, errno.EBADF
+}
+
+
+def is_temporary(path: str) -> bool:
+    """Whether a name is a hidden or in-progress file rather than a drop."""
+    name = os.path.basename(path)
+    return name.startswith(".") or name.endswith(TEMPORARY_SUFFIXES)
+
+
+class SettleTracker:
+    """Waits for dropped files to finish being written, off the observer thread."""
+
+    def __init__(self, on_complete: Callable[[Path], None],
+                 quiet_seconds: float = SETTLE_QUIET_SECONDS,
+                 check_interval: float = SETTLE_CHECK_INTERVAL):
+        self.on_complete = on_complete
+        self.quiet_seconds = quiet_seconds
+        self.check_interval = check_interval
+        # path -> (size, mtime_ns, monotonic time they were last seen changing)
+        self._pending: Dict[Path, Tuple[int, int, float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="settle", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def track(self, path: Path):
+        """Start waiting for a new file to be complete."""
+        with self._lock:
+            self._pending.setdefault(path, (-1, -1, time.monotonic()))
+
+    def closed(self, path: Path):
+        """The writer closed the file: it is complete now (if still pending)."""
+        with self._lock:
+            if self._pending.pop(path, None) is None:
+                return
+        self.on_complete(path)
+
+    def renamed(self, path: Path):
+        """A finished file was renamed into place: it is complete now."""
+        with self._lock:
+            self._pending.pop(path, None)
+        self.on_complete(path)
+
+    def _run(self):
+        # One pass stats every pending file, so concurrent drops settle together
+        while not self._stop.wait(self.check_interval):
+            with self._lock:
+                pending = list(self._pending.items())
+
+            now = time.monotonic()
+            for path, (size, mtime_ns, changed_at) in pending:
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    with self._lock:
+                        self._pending.pop(path, None)
+                    continue
+
+                with self._lock:
+                    if path not in self._pending:
+                        continue  # Closed meanwhile
+                    if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                        self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+                        continue
+                    if now - changed_at < self.quiet_seconds:
+                        continue
+                    del self._pending[path]
+
+                self.on_complete(path)
+
+
+def _kernel_copy(src_fd: int, dest_fd: int, size: int):
+    """Copy size bytes between file descriptors without going through Python."""
+    offset = 0
+    copy_file_range = getattr(os, "copy_file_range", None)
+
+    while offset < size:
+        count = min(COPY_CHUNK, size - offset)
+        if copy_file_range is not None:
+            try:
+                copied = copy_file_range(src_fd, dest_fd, count)
+            except OSError as e:
+                if offset or e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                copy_file_range = None  # e.g. across filesystems on older kernels
+                continue
+        elif hasattr(os, "sendfile"):
+            copied = os.sendfile(dest_fd, src_fd, offset, count)
+        else:
+            raise OSError(errno.ENOSYS, "No in-kernel copy on this platform")
+        if not copied:
+            break  # Source shrank meanwhile
+        offset += copied
+
+
+def _clone_or_copy(src: Path, tmp: Path, reflink: bool) -> str:
+    """Write src to tmp by reflink (if asked and possible) or in-kernel copy."""
+    with open(src, "rb") as fsrc, open(tmp, "wb") as fdest:
+        if reflink and fcntl is not None:
+            try:
+                fcntl.ioctl(fdest.fileno(), FICLONE, fsrc.fileno())
+                return "reflink"
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+
+        try:
+            _kernel_copy(fsrc.fileno(), fdest.fileno(), os.fstat(fsrc.fileno()).st_size)
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS:
+                raise
+            # No kernel copy for these files (e.g. sendfile unsupported): plain read/write
+            fsrc.seek(0)
+            fdest.seek(0)
+            fdest.truncate()
+            shutil.copyfileobj(fsrc, fdest, COPY_CHUNK)
+        return "copy"
+
+
+def ingest_file(src: Path, dest: Path, mode: str = "auto") -> Tuple[str, int]:
+    """
+    Put src at dest using the cheapest method the mode and filesystem allow.
+
+    dest appears atomically (written under a temporary name, then renamed)
+    and keeps src's timestamps and permissions, as shutil.copy2 did.
+
+    Args:
+        src: Dropped file
+        dest: Destination path
+        mode: One of INGEST_MODES
+
+    Returns:
+        (method used: "reflink", "hardlink", "move" or "copy", bytes of file
+        data written)
+    """
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Unknown ingest mode: {mode}")
+
+    if mode == "move":
+        try:
+            os.rename(src, dest)
+            return "move", 0
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        if mode == "hardlink":
+            try:
+                os.link(src, tmp)
+                os.replace(tmp, dest)
+                return "hardlink", 0
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS and e.errno != errno.EMLINK:
+                    raise
+
+        method = _clone_or_copy(src, tmp, reflink=mode in ("auto", "reflink"))
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+    if mode == "move":
+        src.unlink()  # Crossed filesystems: copied, so finish the move
+        return "move", dest.stat().st_size
+    return method, 0 if method == "reflink" else dest.stat().st_size
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file, read in chunks (hashlib releases the GIL per chunk)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK)
+            if not chunk:
+                return digest.hexdigest()
+            digest.update(chunk)
+
+
+class DropIndex:
+    """Content hash -> action item of every drop, in a small SQLite file."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS drops (
+        sha256 TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        original_name TEXT NOT NULL,
+        meta_name TEXT NOT NULL,
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL,
+        duplicates INTEGER NOT NULL DEFAULT 0
+    );
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: SQLite file (default: DROP_INDEX_PATH)
+        """
+        path = Path(path) if path is not None else DROP_INDEX_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def claim(self, sha256: str, size: int, original_name: str, meta_name: str,
+              window_seconds: float, item_exists: Callable[[str], bool]) -> Optional[str]:
+        """
+        Register content as a new action item unless it is a duplicate.
+
+        Content is a duplicate when it was first dropped within the window
+        and its action item still exists (in Needs_Action or Done). The
+        check and the insert are one transaction, so of two identical
+        drops racing each other exactly one becomes the item.
+
+        Args:
+            sha256: Content hash
+            size: File size in bytes
+            original_name: Name the file was dropped under
+            meta_name: Metadata file name of the new action item
+            window_seconds: Dedupe window
+            item_exists: Whether the item with a given metadata name exists
+
+        Returns:
+            Metadata file name of the existing item if a duplicate, else None
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                row = cursor.execute(
+                    "SELECT meta_name, first_seen FROM drops WHERE sha256 = ?", (sha256,)
+                ).fetchone()
+                if row is not None and now - row[1] <= window_seconds and item_exists(row[0]):
+                    cursor.execute(
+                        "UPDATE drops SET last_seen = ?, duplicates = duplicates + 1 WHERE sha256 = ?",
+                        (now, sha256)
+                    )
+                    cursor.execute("COMMIT")
+                    return row[0]
+
+                cursor.execute(
+                    "INSERT OR REPLACE INTO drops (sha256, size, original_name, meta_name, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (sha256, size, original_name, meta_name, now, now)
+                )
+                cursor.execute("COMMIT")
+                return None
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def release(self, sha256: str, meta_name: str):
+        """Forget a claim whose action item could not be created."""
+        with self._lock:
+            self._conn.execute("DELETE FROM drops WHERE sha256 = ? AND meta_name = ?", (sha256, meta_name))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def find_item(meta_name: str) -> Optional[Path]:
+    """Metadata file of an action item, in Needs_Action or (processed) in Done."""
+    stem = Path(meta_name).stem
+    for candidate in (NEEDS_ACTION_PATH / meta_name, DONE_PATH / meta_name, DONE_PATH / f"{stem}_processed.md"):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+@dataclass
+class Drop:
+    """A completed Inbox drop moving through the ingest pipeline."""
+    src_path: Path
+    dest_path: Path
+    meta_path: Path
+    file_type: str
+    created_time: str = ""
+    ingest_method: str = ""
+    sha256: str = ""
+    duplicate_of: str = ""  # Metadata file name of the existing item
+
+    @classmethod
+    def from_path(cls, src_path: Path) -> "Drop":
+        suffix = src_path.suffix.lower()
+        return cls(
+            src_path=src_path,
+            dest_path=NEEDS_ACTION_PATH / f"FILE_{src_path.name}.md",
+            meta_path=NEEDS_ACTION_PATH / f"FILE_{src_path.name}_meta.md",
+            file_type=suffix.lstrip(".") if suffix else "unknown"
+        )
+
+    def __str__(self):
+        return self.src_path.name
+
+
+class IngestPipeline:
+    """
+    Stages connected by bounded queues, each served by its own worker threads.
+
+    An item enters the next stage only after the current one finished with
+    it, so per item the stages run in order; items overlap across stages and
+    workers. submit() blocks while the first queue is full (backpressure).
+    """
+
+    _STOP = object()
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Any], None], int]],
+                 queue_size: int = PIPELINE_QUEUE_SIZE):
+        """
+        Args:
+            stages: (name, function, worker count) in order; an item that
+                raises in a stage is reported and dropped
+            queue_size: Items waiting in front of each stage
+        """
+        self.stages = [
+            (name, func, workers, queue.Queue(maxsize=queue_size))
+            for name, func, workers in stages
+        ]
+        self._threads: List[List[threading.Thread]] = []
+        for index, (name, func, workers, _) in enumerate(self.stages):
+            threads = [
+                threading.Thread(target=self._work, args=(index,), name=f"{name}-{n}", daemon=True)
+                for n in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+            self._threads.append(threads)
+
+    def submit(self, item: Any):
+        """Queue an item for the first stage (blocks while it is full)."""
+        self.stages[0][3].put(item)
+
+    def stop(self):
+        """Finish every submitted item, then stop the workers."""
+        for (_, _, _, inbox), threads in zip(self.stages, self._threads):
+            # Earlier stages have stopped, so nothing else will arrive here
+            for _ in threads:
+                inbox.put(self._STOP)
+            for thread in threads:
+                thread.join()
+
+    def _work(self, index: int):
+        name, func, _, inbox = self.stages[index]
+        outbox = self.stages[index + 1][3] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = inbox.get()
+            if item is self._STOP:
+                return
+            try:
+                func(item)
+            except Exception as e:
+                print(f"Error in {name} stage for {item}: {e}")
+                continue
+            if outbox is not None:
+                outbox.put(item)
 
 
 class DropHandler(FileSystemEventHandler):
+    """
+    Inbox drops flow through: detect (observer) -> settle -> dedupe ->
+    copy -> metadata -> hand-off, each stage off the observer thread.
+    Duplicates skip the copy and are linked to the existing item.
+    """
+
+    def __init__(self, copy_workers: int = COPY_WORKERS, metadata_workers: int = METADATA_WORKERS,
+                 on_ingested: Optional[Callable[[Drop], None]] = None, ingest_mode: str = "auto",
+                 dedupe_window_days: float = DEDUPE_WINDOW_DAYS):
+        """
+        Args:
+            copy_workers: Threads hashing drops, and threads putting them
+                into Needs_Action
+            metadata_workers: Threads writing metadata files
+            on_ingested: Called (on the single hand-off thread) for every
+                drop once its copy and metadata are written, and for every
+                duplicate (drop.duplicate_of set) once it is linked
+            ingest_mode: How drops get into Needs_Action (see INGEST_MODES)
+            dedupe_window_days: Link content seen this recently to its
+                existing item (0: no deduplication)
+        """
+        super().__init__()
+        self.on_ingested = on_ingested
+        self.ingest_mode = ingest_mode
+        self.dedupe_window = dedupe_window_days * 86400
+        self.index = DropIndex() if dedupe_window_days > 0 else None
+        # Links to items whose metadata file is still being written, by meta name
+        self._meta_lock = threading.Lock()
+        self._pending_links: Dict[str, List[str]] = {}
+
+        self.pipeline = IngestPipeline([
+            ("dedupe", self.dedupe, copy_workers),
+            ("copy", self.copy, copy_workers),
+            ("metadata", self.write_metadata, metadata_workers),
+            ("handoff", self.hand_off, 1),
+        ])
+        self.settle = SettleTracker(lambda path: self.pipeline.submit(Drop.from_path(path)))
+        self.settle.start()
+
+    def stop(self):
+        """Stop settling new drops and finish the ones already in the pipeline."""
+        self.settle.stop()
+        self.pipeline.stop()
+        if self.index is not None:
+            self.index.close()
+
     def on_created(self, event):
-        if event.is_directory:
+        if event.is_directory or is_temporary(event.src_path):
             return
+        self.settle.track(Path(event.src_path))
 
-        src_path = Path(event.src_path)
-        original_name = src_path.name
-        dest_name = f"FILE_{original_name}.md"
-        dest_path = NEEDS_ACTION_PATH / dest_name
-        meta_name = f"FILE_{original_name}_meta.md"
-        meta_path = NEEDS_ACTION_PATH / meta_name
+    def on_closed(self, event):
+        # inotify IN_CLOSE_WRITE: the writer is done, no need to wait for quiet
+        if not event.is_directory and not is_temporary(event.src_path):
+            self.settle.closed(Path(event.src_path))
 
-        try:
-            # Wait briefly for the file to finish writing
-            time.sleep(0.5)
+    def on_moved(self, event):
+        # Atomic writers and browsers write a temporary name, then rename it
+        # to the final one; the rename is the only event the final name gets
+        if event.is_directory or is_temporary(event.dest_path):
+            return
+        self.settle.renamed(Path(event.dest_path))
+
+    def dedupe(self, drop: Drop):
+        """Hash the content and check it against earlier drops"""
+        if self.index is None:
+            return
+
+        drop.sha256 = hash_file(drop.src_path)
+        size = drop.src_path.stat().st_size
+
+        # Claim and mark in flight together, so a duplicate of a drop still in
+        # the pipeline sees its item as existing
+        with self._meta_lock:
+            drop.duplicate_of = self.index.claim(
+                drop.sha256, size, drop.src_path.name, drop.meta_path.name, self.dedupe_window,
+                lambda meta_name: meta_name in self._pending_links or find_item(meta_name) is not None
+            ) or ""
+            if not drop.duplicate_of:
+                self._pending_links.setdefault(drop.meta_path.name, [])
+
+    def copy(self, drop: Drop):
+        """Copy (or link, clone, move) file to Needs_Action with FILE_ prefix"""
+        if drop.duplicate_of:
+            return
 
-            # Copy file to Needs_Action with FILE_ prefix
+        try:
             NEEDS_ACTION_PATH.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(str(src_path), str(dest_path))
-
-            # Create metadata file
-            created_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            suffix = src_path.suffix.lower()
-            file_type = suffix.lstrip(".") if suffix else "unknown"
-
-            meta_content = (
-                f"---\n"
-                f"type: file_drop\n"
-                f"original_name: {original_name}\n"
-                f"created: {created_time}\n"
-                f"file_type: {file_type}\n"
-                f"---\n\n"
-                f"# File Drop: {original_name}\n\n"
-                f"## Info\n"
-                f"- **Original name:** {original_name}\n"
-                f"- **Detected type:** {file_type}\n"
-                f"- **Dropped at:** {created_time}\n\n"
-                f"## Suggested Actions\n"
-                f"- [ ] Review file contents\n"
-                f"- [ ] Categorize and tag\n"
-                f"- [ ] Create a plan if action is needed\n"
-                f"- [ ] Move to Done when complete\n"
-            )
-            meta_path.write_text(meta_content, encoding="utf-8")
-
-            print(f"New file processed: {original_name} → {dest_name}")
-
-        except Exception as e:
-            print(f"Error processing {original_name}: {e}")
+            drop.ingest_method, _ = ingest_file(drop.src_path, drop.dest_path, self.ingest_mode)
+        except Exception:
+            if drop.sha256:
+                self.index.release(drop.sha256, drop.meta_path.name)
+                with self._meta_lock:
+                    self._pending_links.pop(drop.meta_path.name, None)
+            raise
+
+    def write_metadata(self, drop: Drop):
+        """Create metadata file (or link a duplicate to the existing one)"""
+        original_name = drop.src_path.name
+        drop.created_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        if drop.duplicate_of:
+            self._link_duplicate(drop)
+            return
+
+        meta_content = (
+            f"---\n"
+            f"type: file_drop\n"
+            f"original_name: {original_name}\n"
+            f"created: {drop.created_time}\n"
+            f"file_type: {drop.file_type}\n"
+            + (f"sha256: {drop.sha256}\n" if drop.sha256 else "") +
+            f"---\n\n"
+            f"# File Drop: {original_name}\n\n"
+            f"## Info\n"
+            f"- **Original name:** {original_name}\n"
+            f"- **Detected type:** {drop.file_type}\n"
+            f"- **Dropped at:** {drop.created_time}\n\n"
+            f"## Suggested Actions\n"
+            f"- [ ] Review file contents\n"
+            f"- [ ] Categorize and tag\n"
+            f"- [ ] Create a plan if action is needed\n"
+            f"- [ ] Move to Done when complete\n"
+        )
+        with self._meta_lock:
+            links = self._pending_links.pop(drop.meta_path.name, [])
+            if links:
+                meta_content += DUPLICATES_HEADING + "".join(links)
+            drop.meta_path.write_text(meta_content, encoding="utf-8")
+
+    def _link_duplicate(self, drop: Drop):
+        """Note a duplicate drop on the existing item instead of creating one"""
+        line = f"- {drop.src_path.name} (dropped {drop.created_time})\n"
+        with self._meta_lock:
+            if drop.duplicate_of in self._pending_links:
+                # The original is still in the pipeline: it writes the link
+                self._pending_links[drop.duplicate_of].append(line)
+                return
+            existing = find_item(drop.duplicate_of)
+            if existing is None:
+                raise FileNotFoundError(f"action item {drop.duplicate_of} disappeared")
+            content = existing.read_text(encoding="utf-8")
+            if DUPLICATES_HEADING not in content:
+                line = DUPLICATES_HEADING + line
+            with open(existing, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def hand_off(self, drop: Drop):
+        """Announce a fully ingested drop (and pass it downstream)"""
+        if drop.duplicate_of:
+            print(f"Duplicate drop: {drop.src_path.name} → linked to {drop.duplicate_of}")
+        else:
+            print(f"New file processed: {drop.src_path.name} → {drop.dest_path.name} ({drop.ingest_method})")
+        if self.on_ingested is not None:
+            self.on_ingested(drop)
+
+
+def filesystem_type(path: Path) -> Optional[str]:
+    """Filesystem type of the mount holding path, from /proc/mounts (None if unknown)."""
+    try:
+        with open("/proc/mounts", "r") as f:
+            mounts = f.read().splitlines()
+    except OSError:
+        return None
+
+    path = os.path.realpath(path)
+    best, best_type = "", None
+    for line in mounts:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        # Mount points escape spaces and tabs as octal (\040, \011)
+        mount_point = fields[1].encode().decode("unicode_escape")
+        inside = path == mount_point or path.startswith(mount_point.rstrip("/") + "/")
+        if inside and len(mount_point) >= len(best):
+            best, best_type = mount_point, fields[2]
+    return best_type
+
+
+def make_observer(mode: str, path: Path) -> Tuple[object, str]:
+    """
+    Create the observer for watching path.
+
+    Args:
+        mode: "inotify", "polling", or "auto" (inotify where it works)
+        path: Directory that will be watched
+
+    Returns:
+        (observer, description for the startup banner)
+    """
+    if mode == "auto":
+        fstype = filesystem_type(path)
+        if not sys.platform.startswith("linux"):
+            mode = "polling"
+            reason = f"no inotify on {sys.platform}"
+        elif fstype in NO_INOTIFY_FSTYPES:
+            mode = "polling"
+            reason = f"{fstype} filesystem does not deliver inotify events"
+        else:
+            mode = "inotify"
+            reason = f"{fstype or 'unknown'} filesystem"
+    else:
+        reason = "selected"
+
+    if mode == "inotify":
+        try:
+            from watchdog.observers.inotify import InotifyObserver
+            return InotifyObserver(), f"inotify ({reason})"
+        except ImportError as e:
+            print(f"inotify unavailable ({e}); falling back to polling")
+            reason = "inotify unavailable"
+
+    return PollingObserver(timeout=POLL_INTERVAL), f"polling every {POLL_INTERVAL}s ({reason})"
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Copy files dropped in Inbox to Needs_Action.")
+    parser.add_argument("--observer", choices=OBSERVER_MODES, default="auto",
+                        help="How to detect new files (default: auto)")
+    parser.add_argument("--ingest", choices=INGEST_MODES, default="auto",
+                        help="How to put drops into Needs_Action (default: auto)")
+    parser.add_argument("--dedupe-window", type=float, default=DEDUPE_WINDOW_DAYS, metavar="DAYS",
+                        help=f"Link re-dropped content to its existing item for this many days "
+                             f"(0 disables; default: {DEDUPE_WINDOW_DAYS})")
+    args = parser.parse_args()
+
     INBOX_PATH.mkdir(parents=True, exist_ok=True)
     NEEDS_ACTION_PATH.mkdir(parents=True, exist_ok=True)
 
-    handler = DropHandler()
-    observer = PollingObserver(timeout=3)
+    handler = DropHandler(ingest_mode=args.ingest, dedupe_window_days=args.dedupe_window)
+    observer, description = make_observer(args.observer, INBOX_PATH)
     observer.schedule(handler, str(INBOX_PATH), recursive=False)
     observer.start()
 
-    print(f"Watching Inbox → Needs_Action (polling every 3s)")
+    print(f"Watching Inbox → Needs_Action ({description}, ingest: {args.ingest})")
     print(f"Vault: {VAULT_PATH}")
     print("Press Ctrl+C to stop.")
 
@@ -82,6 +701,7 @@ def main():
         observer.stop()
 
     observer.join()
+    handler.stop()
     print("Watcher stopped.")
 
 
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Orchestrator Micro-Benchmarks
+
+Measures hot-path costs of the workflow orchestrator so changes can be
+compared before and after.
+
+Usage:
+    python integrations/benchmarks.py [conditions] [templates] [batch] [startup] [metrics]
+
+Gold Tier Feature #5
+"""
+
+import sys
+import json
+import time
+import shutil
+import logging
+import statistics
+import subprocess
+import tempfile
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from integrations.orchestrator import Event, EventType, WorkflowOrchestrator, compile_condition
+from integrations.templates import PLACEHOLDER, compile_template
+from integrations.metrics import MetricsRegistry
+
+
+WORKFLOWS_DIR = Path(__file__).parent / "workflows"
+VAULT_ROOT = Path(__file__).parent.parent
+
+
+SAMPLE_CONDITION = (
+    "'meeting' in event['data'].get('subject', '').lower() or "
+    "'appointment' in event['data'].get('subject', '').lower()"
+)
+
+
+def _time_per_call(func: Callable[[], None], repeat: int) -> float:
+    """Best-of-three microseconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1e6
+
+
+def _sample_event() -> Event:
+    return Event(
+        event_type=EventType.EMAIL_RECEIVED,
+        source="benchmark",
+        data={
+            "subject": "Quarterly planning meeting",
+            "sender": "colleague@company.com",
+            "body": "Let's meet on Tuesday. " * 20,
+            "suggested_date": "2026-02-16",
+            "suggested_time": "14:00"
+        },
+        timestamp=datetime.now().isoformat(),
+        event_id="email_bench"
+    )
+
+
+def bench_conditions(workflows: int = 100, repeat: int = 200) -> Dict[str, float]:
+    """
+    Per-event cost of evaluating trigger conditions for N subscribed workflows.
+
+    "before" rebuilds the event context and evaluates the raw string for
+    every workflow; "after" builds the context once and evaluates the
+    cached code objects.
+
+    Args:
+        workflows: Number of subscribed workflows with a condition
+        repeat: Events per timing run
+
+    Returns:
+        Microseconds per event for each variant
+    """
+    event = _sample_event()
+    # Distinct expressions, as a real workflow library would have
+    conditions = [f"{SAMPLE_CONDITION} or {i} < 0" for i in range(workflows)]
+    safe_globals = {"__builtins__": {}}
+
+    def before():
+        for condition in conditions:
+            eval(condition, safe_globals, {'event': asdict(event)})
+
+    def after():
+        context = {'event': asdict(event)}
+        for condition in conditions:
+            eval(compile_condition(condition), safe_globals, context)
+
+    after()  # warm the compile cache, as load_workflows does
+    results = {
+        "before_us": _time_per_call(before, repeat),
+        "after_us": _time_per_call(after, repeat)
+    }
+    results["speedup"] = results["before_us"] / results["after_us"]
+    return results
+
+
+def _legacy_resolve(parameters: Dict, context: Dict) -> Dict:
+    """The resolver templates replaced: whole-value {{path}} only, split per call."""
+    resolved = {}
+    for key, value in parameters.items():
+        if isinstance(value, str) and value.startswith("{{") and value.endswith("}}"):
+            resolved[key] = context
+            for part in value[2:-2].strip().split('.'):
+                resolved[key] = resolved[key].get(part) if isinstance(resolved[key], dict) else None
+        else:
+            resolved[key] = value
+    return resolved
+
+
+def bench_templates(repeat: int = 2000) -> Dict[str, float]:
+    """
+    Cost of resolving the parameters of every action in the shipped workflows.
+
+    "legacy" is the old whole-value-only resolver (it leaves embedded
+    placeholders unrendered); "parse_per_call" renders fully but compiles
+    on every call; "compiled" renders with templates compiled at load.
+
+    Args:
+        repeat: Passes over all actions per timing run
+
+    Returns:
+        Microseconds per pass for each variant
+    """
+    actions = []
+    for workflow_file in sorted(WORKFLOWS_DIR.glob("*.json")):
+        with open(workflow_file, 'r') as f:
+            actions.extend(a['parameters'] for a in json.load(f)['actions'])
+
+    # A context that fills every placeholder used by the shipped workflows
+    paths = {
+        match.group(1)
+        for parameters in actions
+        for match in PLACEHOLDER.finditer(json.dumps(parameters))
+    }
+    context = {'event': {'data': {}}, 'workflow': {'id': 'bench', 'name': 'Benchmark'}, 'results': {}}
+    for path in paths:
+        keys = path.split('.')
+        target = context
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = f"<{keys[-1]}>"
+
+    compiled = [compile_template(parameters) for parameters in actions]
+
+    results = {
+        "actions": float(len(actions)),
+        "legacy_us": _time_per_call(lambda: [_legacy_resolve(p, context) for p in actions], repeat),
+        "parse_per_call_us": _time_per_call(lambda: [compile_template(p)(context) for p in actions], repeat),
+        "compiled_us": _time_per_call(lambda: [render(context) for render in compiled], repeat)
+    }
+    return results
+
+
+def _scratch_orchestrator(vault: Path) -> WorkflowOrchestrator:
+    """Orchestrator over a throwaway vault holding copies of the shipped workflows."""
+    shutil.copytree(WORKFLOWS_DIR, vault / "integrations" / "workflows")
+    for folder in ("Logs", "Inbox", "Pending_Approval", "audit"):
+        (vault / folder).mkdir(parents=True, exist_ok=True)
+
+    # Keep benchmark entries out of the real audit trail
+    orchestrator = WorkflowOrchestrator(str(vault), audit_dir=vault / "audit")
+    logging.getLogger("Orchestrator").setLevel(logging.WARNING)
+    return orchestrator
+
+
+def bench_batch(events: int = 10000) -> Dict[str, float]:
+    """
+    Backfill of N synthetic invoice events: process_event one at a time
+    versus one process_events call.
+
+    Args:
+        events: Number of invoice events
+
+    Returns:
+        Events per second for each variant
+    """
+    def invoices():
+        return [
+            Event(
+                event_type=EventType.INVOICE_CREATED,
+                source="benchmark",
+                data={
+                    "invoice_number": f"INV-{i:06d}",
+                    "customer_id": i % 50,
+                    # Every other invoice is below the workflow's threshold
+                    "amount": 50.0 if i % 2 else 1500.0,
+                    "customer_email": f"customer{i % 50}@example.com",
+                    "items": []
+                },
+                timestamp=datetime.now().isoformat(),
+                event_id=f"invoice_{i:06d}"
+            )
+            for i in range(events)
+        ]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        for variant in ("per_event", "batch"):
+            orchestrator = _scratch_orchestrator(Path(scratch) / variant)
+            batch = invoices()
+
+            start = time.perf_counter()
+            if variant == "batch":
+                orchestrator.process_events(batch)
+            else:
+                for event in batch:
+                    orchestrator.process_event(event)
+                orchestrator.flush_state()
+                orchestrator.audit_logger.flush()
+            results[f"{variant}_events_per_s"] = events / (time.perf_counter() - start)
+
+            orchestrator.shutdown()
+
+    results["speedup"] = results["batch_events_per_s"] / results["per_event_events_per_s"]
+    return results
+
+
+# Runs in a fresh interpreter: argv is (vault, "cold" | "warm"); prints timings as JSON
+STARTUP_PROBE = """
+import sys, json, time
+vault, mode = sys.argv[1], sys.argv[2]
+sys.path.insert(0, vault)
+timings = {}
+
+start = time.perf_counter()
+import integrations.integration_helper as helper
+timings["import_ms"] = (time.perf_counter() - start) * 1e3
+helper.VAULT_PATH = vault
+
+if mode == "warm":
+    start = time.perf_counter()
+    helper.prewarm()
+    timings["prewarm_ms"] = (time.perf_counter() - start) * 1e3
+
+start = time.perf_counter()
+helper.trigger_invoice_created("INV-STARTUP", 7, 5000.0, "customer@example.com")
+timings["first_event_ms"] = (time.perf_counter() - start) * 1e3
+print(json.dumps(timings))
+"""
+
+
+def _scratch_vault(vault: Path) -> Path:
+    """Throwaway vault with a copy of the code, so runs start from clean state."""
+    runtime_files = shutil.ignore_patterns(
+        "*.sqlite3*", "orchestrator_state.json", "*.log", "audit", "*.md"
+    )
+    shutil.copytree(VAULT_ROOT / "integrations", vault / "integrations", ignore=runtime_files)
+    shutil.copytree(VAULT_ROOT / "Logs", vault / "Logs", ignore=runtime_files)
+    for folder in ("Inbox", "Pending_Approval"):
+        (vault / folder).mkdir(parents=True, exist_ok=True)
+    return vault
+
+
+def bench_startup(runs: int = 5) -> Dict[str, float]:
+    """
+    First-event latency of a fresh process using integration_helper.
+
+    "cold" triggers straight after import, so the first event builds the
+    orchestrator; "warm" calls prewarm() first, as a watcher does at startup.
+    Each run uses a new interpreter and a new scratch vault (bytecode is
+    compiled by an untimed first run).
+
+    Args:
+        runs: Processes per variant (medians are reported)
+
+    Returns:
+        Median milliseconds for import, prewarm and the first event
+    """
+    samples: Dict[str, list] = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        template = _scratch_vault(Path(scratch) / "template")
+        subprocess.run([sys.executable, "-c", STARTUP_PROBE, str(template), "cold"],
+                       check=True, capture_output=True)
+
+        for run in range(runs):
+            for mode in ("cold", "warm"):
+                vault = Path(scratch) / f"{mode}_{run}"
+                shutil.copytree(template, vault, ignore=shutil.ignore_patterns(
+                    "*.sqlite3*", "orchestrator_state.json", "*.log", "audit", "Inbox", "Pending_Approval"
+                ))
+                for folder in ("Inbox", "Pending_Approval"):
+                    (vault / folder).mkdir()
+
+                output = subprocess.run([sys.executable, "-c", STARTUP_PROBE, str(vault), mode],
+                                        check=True, capture_output=True, text=True).stdout
+                for key, value in json.loads(output.strip().splitlines()[-1]).items():
+                    samples.setdefault(f"{mode}_{key}", []).append(value)
+
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+def bench_metrics(repeat: int = 100000) -> Dict[str, float]:
+    """
+    Cost of recording one metric, as the orchestrator does on its hot path.
+
+    Args:
+        repeat: Records per timing run
+
+    Returns:
+        Nanoseconds per counter increment, histogram observation, and timed
+        observation (two perf_counter calls plus the observation)
+    """
+    metrics = MetricsRegistry(prefix="bench_")
+    runs = metrics.counter("runs_total", "Runs", ("action", "status"))
+    seconds = metrics.histogram("phase_duration_seconds", "Latency", ("phase", "action"))
+
+    def timed():
+        started = time.perf_counter()
+        seconds.observe(time.perf_counter() - started, "render", "send_email")
+
+    return {
+        "counter_ns": _time_per_call(lambda: runs.inc("send_email", "success"), repeat) * 1e3,
+        "histogram_ns": _time_per_call(lambda: seconds.observe(0.0042, "render", "send_email"), repeat) * 1e3,
+        "timed_histogram_ns": _time_per_call(timed, repeat) * 1e3
+    }
+
+
+BENCHMARKS = {
+    "conditions": bench_conditions,
+    "templates": bench_templates,
+    "batch": bench_batch,
+    "startup": bench_startup,
+    "metrics": bench_metrics,
+}
+
+
+def main():
+    """Run the named benchmarks (all by default)."""
+    names = sys.argv[1:] or list(BENCHMARKS)
+
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name}")
+            print(f"Usage: python benchmarks.py [{'|'.join(BENCHMARKS)}]")
+            continue
+
+        results = BENCHMARKS[name]()
+        print(f"{name}:")
+        for key, value in results.items():
+            print(f"  {key}: {value:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
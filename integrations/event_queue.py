@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Durable Event Queue
+
+Local SQLite-backed queue between event producers (watchers, MCP hooks) and
+the WorkflowOrchestrator. Producers enqueue and return immediately; a
+consumer drains the queue in batches and acknowledges events once they have
+been processed, so nothing is lost if either side crashes.
+
+Delivery is at-least-once: an event leased by a consumer that dies before
+acknowledging it becomes visible again when the lease expires or when a
+consumer starts up.
+
+Usage:
+    python integrations/event_queue.py consume   # Drain into the orchestrator
+    python integrations/event_queue.py stats     # Queue depth and lag
+
+Gold Tier Feature #5
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from integrations.events import Event, event_to_json, event_from_json
+
+
+QUEUE_FILENAME = "event_queue.sqlite3"
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_POLL_INTERVAL = 0.5
+MAX_ATTEMPTS = 5  # Deliveries before an event is parked as dead
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    enqueued_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    dead INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ready ON events(dead, lease_until, seq);
+"""
+
+
+class EventQueue:
+    """SQLite WAL queue with leases and acknowledgements."""
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) a queue.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL survives process crashes; only an OS crash can lose the last commits
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def enqueue(self, event: Event) -> int:
+        """
+        Append an event to the queue.
+
+        Args:
+            event: Event to deliver
+
+        Returns:
+            Queue sequence number
+        """
+        return self.enqueue_many([event])[0]
+
+    def enqueue_many(self, events: List[Event]) -> List[int]:
+        """
+        Append several events in one transaction.
+
+        Args:
+            events: Events to deliver, in order
+
+        Returns:
+            Queue sequence numbers
+        """
+        now = time.time()
+        rows = [(e.event_id, e.event_type.value, event_to_json(e), now) for e in events]
+
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                seqs = []
+                for row in rows:
+                    cursor.execute(
+                        "INSERT INTO events (event_id, event_type, payload, enqueued_at) VALUES (?, ?, ?, ?)",
+                        row
+                    )
+                    seqs.append(cursor.lastrowid)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+        return seqs
+
+    def lease(self, batch_size: int = DEFAULT_BATCH_SIZE,
+              lease_seconds: float = DEFAULT_LEASE_SECONDS) -> List[Tuple[int, Event]]:
+        """
+        Take the oldest deliverable events for processing.
+
+        Leased events are hidden from other consumers until they are
+        acknowledged, released, or the lease expires.
+
+        Args:
+            batch_size: Maximum events to return
+            lease_seconds: How long the events stay hidden
+
+        Returns:
+            (sequence number, event) pairs in enqueue order
+        """
+        now = time.time()
+
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                rows = cursor.execute(
+                    "SELECT seq, payload FROM events "
+                    "WHERE dead = 0 AND (lease_until IS NULL OR lease_until < ?) "
+                    "ORDER BY seq LIMIT ?",
+                    (now, batch_size)
+                ).fetchall()
+                cursor.executemany(
+                    "UPDATE events SET lease_until = ?, attempts = attempts + 1 WHERE seq = ?",
+                    [(now + lease_seconds, seq) for seq, _ in rows]
+                )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+        return [(seq, event_from_json(payload)) for seq, payload in rows]
+
+    def ack(self, seqs: List[int]):
+        """Remove processed events."""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany("DELETE FROM events WHERE seq = ?", [(seq,) for seq in seqs])
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def nack(self, seqs: List[int], error: Optional[str] = None):
+        """
+        Return events for redelivery, parking those out of attempts.
+
+        Args:
+            seqs: Sequence numbers that failed
+            error: Reason, kept for inspection
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(
+                    "UPDATE events SET lease_until = NULL, last_error = ?, "
+                    "dead = CASE WHEN attempts >= ? THEN 1 ELSE 0 END WHERE seq = ?",
+                    [(error, MAX_ATTEMPTS, seq) for seq in seqs]
+                )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def release_leases(self) -> int:
+        """
+        Make events whose lease has expired deliverable again.
+
+        Leases still held by a live consumer are left alone, so this is
+        safe to call while other consumers share the queue.
+
+        Returns:
+            Number of events released
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE events SET lease_until = NULL WHERE lease_until < ? AND dead = 0",
+                (time.time(),)
+            )
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth and lag.
+
+        Returns:
+            Dictionary with ready, in-flight and dead counts and the age of
+            the oldest undelivered event in seconds
+        """
+        now = time.time()
+
+        with self._lock:
+            ready, in_flight, dead, oldest = self._conn.execute(
+                "SELECT "
+                "  SUM(dead = 0 AND (lease_until IS NULL OR lease_until < ?)), "
+                "  SUM(dead = 0 AND lease_until >= ?), "
+                "  SUM(dead), "
+                "  MIN(CASE WHEN dead = 0 THEN enqueued_at END) "
+                "FROM events",
+                (now, now)
+            ).fetchone()
+
+        return {
+            "depth": (ready or 0) + (in_flight or 0),
+            "ready": ready or 0,
+            "in_flight": in_flight or 0,
+            "dead": dead or 0,
+            "lag_seconds": round(now - oldest, 3) if oldest is not None else 0.0
+        }
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class QueueConsumer:
+    """Drains an EventQueue into a WorkflowOrchestrator."""
+
+    def __init__(self, orchestrator, queue: EventQueue,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Initialize the consumer.
+
+        Args:
+            orchestrator: WorkflowOrchestrator that processes the events
+            queue: Queue to drain
+            batch_size: Events leased per batch
+            poll_interval: Seconds to sleep when the queue is empty
+        """
+        self.orchestrator = orchestrator
+        self.queue = queue
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+
+    def run_once(self) -> int:
+        """
+        Lease, process and acknowledge one batch.
+
+        Events whose workflows fail are still acknowledged: the failure is
+        already audited. Only events the orchestrator could not process at
+        all are returned for redelivery.
+
+        Returns:
+            Number of events processed
+        """
+        batch = self.queue.lease(self.batch_size)
+        if not batch:
+            return 0
+
+        done, failed = [], []
+        pending = []
+        for seq, event in batch:
+            try:
+                # Submit the whole batch first so a worker pool can overlap it
+                pending.append((seq, self.orchestrator.process_event(event, wait=False)))
+            except Exception as e:
+                self.orchestrator.logger.error(f"Error processing queued event {event.event_id}: {e}")
+                failed.append(seq)
+
+        for seq, futures in pending:
+            for future in futures:
+                try:
+                    future.result()
+                except Exception:
+                    pass  # Already logged and audited by the orchestrator
+            done.append(seq)
+
+        if done:
+            self.queue.ack(done)
+        if failed:
+            self.queue.nack(failed, error="process_event failed")
+
+        return len(batch)
+
+    def run(self):
+        """Process batches until stop() is called."""
+        # Expired leases from a consumer that died are replayed; live ones are not touched
+        released = self.queue.release_leases()
+        if released:
+            self.orchestrator.logger.info(f"Replaying {released} events with expired leases")
+
+        while not self._stop.is_set():
+            if not self.run_once():
+                self._stop.wait(self.poll_interval)
+
+    def stop(self):
+        """Ask run() to return after the current batch."""
+        self._stop.set()
+
+
+def get_queue(vault_path: str) -> EventQueue:
+    """Open the vault's event queue."""
+    return EventQueue(Path(vault_path) / "integrations" / QUEUE_FILENAME)
+
+
+def main():
+    """Command-line interface for the event queue."""
+    from integrations.integration_helper import VAULT_PATH, get_orchestrator
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    queue = get_queue(VAULT_PATH)
+
+    if command == "consume":
+        consumer = QueueConsumer(get_orchestrator(), queue)
+        try:
+            consumer.run()
+        except KeyboardInterrupt:
+            consumer.stop()
+    elif command == "stats":
+        print(json.dumps(queue.stats(), indent=2))
+    else:
+        print(f"Unknown command: {command}")
+        print("Usage: python event_queue.py [consume|stats]")
+
+
+if __name__ == "__main__":
+    main()
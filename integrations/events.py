@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Workflow Events
+
+Event types and the Event record shared by producers (integration_helper,
+watchers), the durable queue and the orchestrator. Kept free of heavy imports
+so producers can build and enqueue events without loading the orchestrator.
+
+Gold Tier Feature #5
+"""
+
+import json
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict
+
+
+class EventType(Enum):
+    """Types of events that can trigger workflows"""
+    EMAIL_RECEIVED = "email_received"
+    CALENDAR_EVENT = "calendar_event"
+    INVOICE_CREATED = "invoice_created"
+    EXPENSE_RECORDED = "expense_recorded"
+    LINKEDIN_POST = "linkedin_post"
+    FILE_ADDED = "file_added"
+    APPROVAL_RECEIVED = "approval_received"
+    SCHEDULED_TRIGGER = "scheduled_trigger"
+    MANUAL_TRIGGER = "manual_trigger"
+
+
+@dataclass
+class Event:
+    """Represents a system event that can trigger workflows"""
+    event_type: EventType
+    source: str
+    data: Dict[str, Any]
+    timestamp: str
+    event_id: str
+
+
+def event_to_json(event: Event) -> str:
+    """Serialize an event for storage (queue, scheduled continuations)."""
+    return json.dumps({
+        "event_type": event.event_type.value,
+        "source": event.source,
+        "data": event.data,
+        "timestamp": event.timestamp,
+        "event_id": event.event_id
+    }, default=str)
+
+
+def event_from_json(payload: str) -> Event:
+    """Rebuild an event from its stored form."""
+    data = json.loads(payload)
+    data["event_type"] = EventType(data["event_type"])
+    return Event(**data)
@@ -14,47 +14,130 @@ Usage:
         amount=5000.00,
         customer_email="customer@example.com"
     )
+
+    # Hand events to the durable queue instead of running workflows here
+    # (drained by: python integrations/event_queue.py consume)
+    set_delivery_mode("queue")
+
+    # Watchers: build the orchestrator at startup, not in the first event callback
+    prewarm()
+
+Importing this module only loads the event types; the orchestrator (and the
+audit logger, scheduler and workflow definitions behind it) is imported and
+built on first use, or ahead of time by prewarm().
 """
 
+import os
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime
-import uuid
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from integrations.orchestrator import WorkflowOrchestrator, Event, EventType
+from integrations.events import Event, EventType
 
 
 # Global orchestrator instance
 VAULT_PATH = "/mnt/f/Maryam/Quarter_4/Ai_Employee_Vault"
 _orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+# "direct" runs workflows in the caller; "queue" enqueues for the consumer
+DELIVERY_MODES = ("direct", "queue")
+DELIVERY_MODE = "direct"
+_event_queue = None
+_event_queue_lock = threading.Lock()
 
 
 def get_orchestrator():
     """Get or create orchestrator instance"""
     global _orchestrator
     if _orchestrator is None:
-        _orchestrator = WorkflowOrchestrator(VAULT_PATH)
+        # Watcher callbacks may race to build it; only one may
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                from integrations.orchestrator import WorkflowOrchestrator
+                _orchestrator = WorkflowOrchestrator(VAULT_PATH)
     return _orchestrator
 
 
-def trigger_invoice_created(invoice_number: str, customer_id: int, amount: float,
-                           customer_email: str = None, items: list = None):
+def get_event_queue():
+    """Get or open the durable event queue"""
+    global _event_queue
+    if _event_queue is None:
+        with _event_queue_lock:
+            if _event_queue is None:
+                from integrations.event_queue import get_queue
+                _event_queue = get_queue(VAULT_PATH)
+    return _event_queue
+
+
+def prewarm(background: bool = False):
     """
-    Trigger invoice creation workflow.
+    Build whatever the current delivery mode needs before the first event.
+
+    Call at watcher startup so the first event does not pay for imports,
+    logging setup, the audit logger and workflow parsing.
 
     Args:
-        invoice_number: Invoice ID
-        customer_id: Odoo customer ID
-        amount: Total invoice amount
-        customer_email: Customer email address
-        items: List of invoice line items
+        background: Warm up on a daemon thread and return immediately (a
+            trigger arriving meanwhile waits for it to finish)
+
+    Returns:
+        The warm-up thread when background is True, otherwise None
     """
-    orchestrator = get_orchestrator()
+    warm = get_event_queue if DELIVERY_MODE == "queue" else get_orchestrator
+    if not background:
+        warm()
+        return None
 
-    event = Event(
+    thread = threading.Thread(target=warm, name="integration-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def set_delivery_mode(mode: str):
+    """
+    Choose how trigger_* helpers deliver events.
+
+    Args:
+        mode: "direct" to run matching workflows before returning, or
+            "queue" to enqueue the event and return immediately
+    """
+    global DELIVERY_MODE
+    if mode not in DELIVERY_MODES:
+        raise ValueError(f"Unknown delivery mode: {mode}")
+    DELIVERY_MODE = mode
+
+
+def _deliver(event: Event) -> list:
+    """Process an event now, or enqueue it (returning no workflow IDs yet)"""
+    if DELIVERY_MODE == "queue":
+        get_event_queue().enqueue(event)
+        return []
+    return get_orchestrator().process_event(event)
+
+
+def _deliver_many(events: list) -> list:
+    """
+    Process a batch of events together, or enqueue them in one transaction.
+
+    Returns:
+        One result per event: {"event_id", "executed", "failed"} when
+        processed, {"event_id", "queued"} when enqueued
+    """
+    if DELIVERY_MODE == "queue":
+        seqs = get_event_queue().enqueue_many(events)
+        return [{"event_id": event.event_id, "queued": seq} for event, seq in zip(events, seqs)]
+    return get_orchestrator().process_events(events)
+
+
+def _invoice_created_event(invoice_number: str, customer_id: int, amount: float,
+                           customer_email: str = None, items: list = None) -> Event:
+    """Build the event for trigger_invoice_created"""
+    return Event(
         event_type=EventType.INVOICE_CREATED,
         source="odoo_mcp",
         data={
@@ -65,27 +148,29 @@ def trigger_invoice_created(invoice_number: str, customer_id: int, amount: float
             "items": items or []
         },
         timestamp=datetime.now().isoformat(),
-        event_id=f"invoice_{uuid.uuid4().hex[:8]}"
+        event_id=f"invoice_{os.urandom(4).hex()}"
     )
 
-    return orchestrator.process_event(event)
-
 
-def trigger_email_received(subject: str, sender: str, body: str,
-                          suggested_date: str = None, suggested_time: str = None):
+def trigger_invoice_created(invoice_number: str, customer_id: int, amount: float,
+                           customer_email: str = None, items: list = None):
     """
-    Trigger email received workflow.
+    Trigger invoice creation workflow.
 
     Args:
-        subject: Email subject
-        sender: Sender email address
-        body: Email body content
-        suggested_date: Suggested meeting date (if meeting email)
-        suggested_time: Suggested meeting time (if meeting email)
+        invoice_number: Invoice ID
+        customer_id: Odoo customer ID
+        amount: Total invoice amount
+        customer_email: Customer email address
+        items: List of invoice line items
     """
-    orchestrator = get_orchestrator()
+    return _deliver(_invoice_created_event(invoice_number, customer_id, amount, customer_email, items))
 
-    event = Event(
+
+def _email_received_event(subject: str, sender: str, body: str,
+                          suggested_date: str = None, suggested_time: str = None) -> Event:
+    """Build the event for trigger_email_received"""
+    return Event(
         event_type=EventType.EMAIL_RECEIVED,
         source="gmail_watcher",
         data={
@@ -97,24 +182,28 @@ def trigger_email_received(subject: str, sender: str, body: str,
             "received_at": datetime.now().isoformat()
         },
         timestamp=datetime.now().isoformat(),
-        event_id=f"email_{uuid.uuid4().hex[:8]}"
+        event_id=f"email_{os.urandom(4).hex()}"
     )
 
-    return orchestrator.process_event(event)
-
 
-def trigger_expense_recorded(name: str, amount: float, date: str = None):
+def trigger_email_received(subject: str, sender: str, body: str,
+                          suggested_date: str = None, suggested_time: str = None):
     """
-    Trigger expense recorded workflow.
+    Trigger email received workflow.
 
     Args:
-        name: Expense description
-        amount: Expense amount
-        date: Expense date
+        subject: Email subject
+        sender: Sender email address
+        body: Email body content
+        suggested_date: Suggested meeting date (if meeting email)
+        suggested_time: Suggested meeting time (if meeting email)
     """
-    orchestrator = get_orchestrator()
+    return _deliver(_email_received_event(subject, sender, body, suggested_date, suggested_time))
 
-    event = Event(
+
+def _expense_recorded_event(name: str, amount: float, date: str = None) -> Event:
+    """Build the event for trigger_expense_recorded"""
+    return Event(
         event_type=EventType.EXPENSE_RECORDED,
         source="odoo_mcp",
         data={
@@ -123,23 +212,25 @@ def trigger_expense_recorded(name: str, amount: float, date: str = None):
             "date": date or datetime.now().strftime("%Y-%m-%d")
         },
         timestamp=datetime.now().isoformat(),
-        event_id=f"expense_{uuid.uuid4().hex[:8]}"
+        event_id=f"expense_{os.urandom(4).hex()}"
     )
 
-    return orchestrator.process_event(event)
-
 
-def trigger_linkedin_post_scheduled(post_content: str, image_path: str = None):
+def trigger_expense_recorded(name: str, amount: float, date: str = None):
     """
-    Trigger LinkedIn post workflow.
+    Trigger expense recorded workflow.
 
     Args:
-        post_content: Post text content
-        image_path: Optional image path
+        name: Expense description
+        amount: Expense amount
+        date: Expense date
     """
-    orchestrator = get_orchestrator()
+    return _deliver(_expense_recorded_event(name, amount, date))
+
 
-    event = Event(
+def _linkedin_post_scheduled_event(post_content: str, image_path: str = None) -> Event:
+    """Build the event for trigger_linkedin_post_scheduled"""
+    return Event(
         event_type=EventType.CALENDAR_EVENT,
         source="calendar",
         data={
@@ -148,22 +239,24 @@ def trigger_linkedin_post_scheduled(post_content: str, image_path: str = None):
             "image_path": image_path
         },
         timestamp=datetime.now().isoformat(),
-        event_id=f"linkedin_{uuid.uuid4().hex[:8]}"
+        event_id=f"linkedin_{os.urandom(4).hex()}"
     )
 
-    return orchestrator.process_event(event)
 
-
-def trigger_morning_routine(pending_count: int = 0):
+def trigger_linkedin_post_scheduled(post_content: str, image_path: str = None):
     """
-    Trigger morning automation routine.
+    Trigger LinkedIn post workflow.
 
     Args:
-        pending_count: Number of pending approvals
+        post_content: Post text content
+        image_path: Optional image path
     """
-    orchestrator = get_orchestrator()
+    return _deliver(_linkedin_post_scheduled_event(post_content, image_path))
 
-    event = Event(
+
+def _morning_routine_event(pending_count: int = 0) -> Event:
+    """Build the event for trigger_morning_routine"""
+    return Event(
         event_type=EventType.SCHEDULED_TRIGGER,
         source="scheduler",
         data={
@@ -175,20 +268,20 @@ def trigger_morning_routine(pending_count: int = 0):
         event_id=f"morning_{datetime.now().strftime('%Y%m%d')}"
     )
 
-    return orchestrator.process_event(event)
-
 
-def trigger_file_added(file_path: str, file_type: str):
+def trigger_morning_routine(pending_count: int = 0):
     """
-    Trigger file added workflow.
+    Trigger morning automation routine.
 
     Args:
-        file_path: Path to added file
-        file_type: Type of file (email, invoice, etc.)
+        pending_count: Number of pending approvals
     """
-    orchestrator = get_orchestrator()
+    return _deliver(_morning_routine_event(pending_count))
+
 
-    event = Event(
+def _file_added_event(file_path: str, file_type: str) -> Event:
+    """Build the event for trigger_file_added"""
+    return Event(
         event_type=EventType.FILE_ADDED,
         source="filesystem_watcher",
         data={
@@ -197,24 +290,24 @@ def trigger_file_added(file_path: str, file_type: str):
             "added_at": datetime.now().isoformat()
         },
         timestamp=datetime.now().isoformat(),
-        event_id=f"file_{uuid.uuid4().hex[:8]}"
+        event_id=f"file_{os.urandom(4).hex()}"
     )
 
-    return orchestrator.process_event(event)
-
 
-def trigger_approval_received(approval_type: str, approved: bool, details: dict = None):
+def trigger_file_added(file_path: str, file_type: str):
     """
-    Trigger approval workflow.
+    Trigger file added workflow.
 
     Args:
-        approval_type: Type of approval (invoice, expense, email, etc.)
-        approved: Whether approved or rejected
-        details: Additional approval details
+        file_path: Path to added file
+        file_type: Type of file (email, invoice, etc.)
     """
-    orchestrator = get_orchestrator()
+    return _deliver(_file_added_event(file_path, file_type))
+
 
-    event = Event(
+def _approval_received_event(approval_type: str, approved: bool, details: dict = None) -> Event:
+    """Build the event for trigger_approval_received"""
+    return Event(
         event_type=EventType.APPROVAL_RECEIVED,
         source="human",
         data={
@@ -224,10 +317,48 @@ def trigger_approval_received(approval_type: str, approved: bool, details: dict
             "approved_at": datetime.now().isoformat()
         },
         timestamp=datetime.now().isoformat(),
-        event_id=f"approval_{uuid.uuid4().hex[:8]}"
+        event_id=f"approval_{os.urandom(4).hex()}"
     )
 
-    return orchestrator.process_event(event)
+
+def trigger_approval_received(approval_type: str, approved: bool, details: dict = None):
+    """
+    Trigger approval workflow.
+
+    Args:
+        approval_type: Type of approval (invoice, expense, email, etc.)
+        approved: Whether approved or rejected
+        details: Additional approval details
+    """
+    return _deliver(_approval_received_event(approval_type, approved, details))
+
+
+# Bulk variants (backfills, replays): each takes an iterable of dicts holding
+# the keyword arguments of the single-event trigger and returns per-event results
+
+def trigger_invoices_created(invoices) -> list:
+    """Trigger invoice creation workflows for many invoices (see trigger_invoice_created)"""
+    return _deliver_many([_invoice_created_event(**invoice) for invoice in invoices])
+
+
+def trigger_emails_received(emails) -> list:
+    """Trigger email received workflows for many emails (see trigger_email_received)"""
+    return _deliver_many([_email_received_event(**email) for email in emails])
+
+
+def trigger_expenses_recorded(expenses) -> list:
+    """Trigger expense workflows for many expenses (see trigger_expense_recorded)"""
+    return _deliver_many([_expense_recorded_event(**expense) for expense in expenses])
+
+
+def trigger_files_added(files) -> list:
+    """Trigger file added workflows for many files (see trigger_file_added)"""
+    return _deliver_many([_file_added_event(**added) for added in files])
+
+
+def trigger_approvals_received(approvals) -> list:
+    """Trigger approval workflows for many approvals (see trigger_approval_received)"""
+    return _deliver_many([_approval_received_event(**approval) for approval in approvals])
 
 
 # Example usage
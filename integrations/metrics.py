@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Orchestrator Metrics
+
+In-process counters and latency histograms, cheap enough to leave on: a
+record is a thread-local lookup, a dict lookup, a bisect over fixed bucket
+bounds and two additions, with no lock (a few hundred nanoseconds). The
+registry is exported as Prometheus text (for the node_exporter textfile collector) or as
+a JSON snapshot.
+
+Usage:
+    metrics = MetricsRegistry()
+    runs = metrics.counter("workflow_runs_total", "Workflow runs", ("workflow", "status"))
+    runs.inc("invoice_notification", "success")
+
+    seconds = metrics.histogram("action_duration_seconds", "Action latency", ("action",))
+    seconds.observe(0.0042, "send_email")
+
+    metrics.write(Path("Logs/orchestrator_metrics.prom"))
+
+Gold Tier Feature #5
+"""
+
+import json
+import threading
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from Logs.vault_io import atomic_write
+
+# Latency bucket upper bounds in seconds (100us .. 1min); +Inf is implicit
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+class _Family:
+    """
+    A metric with fixed label names, sharded per recording thread.
+
+    Each thread records into its own dict of series, so the hot path takes
+    no lock; readers merge the shards (copying each, which is atomic).
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards: List[Dict[Tuple[str, ...], Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _new_shard(self) -> Dict[Tuple[str, ...], Any]:
+        shard = self._local.series = {}
+        with self._shards_lock:
+            self._shards.append(shard)
+        return shard
+
+    def _shard_copies(self) -> List[Dict[Tuple[str, ...], Any]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [shard.copy() for shard in shards]
+
+
+class Counter(_Family):
+    """Monotonic counter family."""
+
+    kind = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1):
+        """Add amount to the series for label_values (in label order)."""
+        try:
+            shard = self._local.series
+        except AttributeError:
+            shard = self._new_shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def _collect(self) -> Dict[Tuple[str, ...], float]:
+        merged: Dict[Tuple[str, ...], float] = {}
+        for shard in self._shard_copies():
+            for key, value in shard.items():
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """(sample name, labels, value) for every series."""
+        return [(self.name, dict(zip(self.labels, key)), value) for key, value in self._collect().items()]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [{"labels": dict(zip(self.labels, key)), "value": value} for key, value in self._collect().items()]
+
+
+class Histogram(_Family):
+    """Fixed-bucket histogram family (Prometheus semantics)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._bounds = self.buckets + (float("inf"),)
+
+    def observe(self, value: float, *label_values: str):
+        """Record one value (seconds) for label_values (in label order)."""
+        try:
+            shard = self._local.series
+        except AttributeError:
+            shard = self._new_shard()
+        series = shard.get(label_values)
+        if series is None:
+            # Per-bucket counts (the last one is +Inf), then the sum
+            series = shard[label_values] = [0] * len(self._bounds) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def _collect(self) -> Dict[Tuple[str, ...], List[float]]:
+        merged: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in self._shard_copies():
+            for key, series in shard.items():
+                series = list(series)
+                total = merged.get(key)
+                merged[key] = series if total is None else [a + b for a, b in zip(total, series)]
+        return merged
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Cumulative _bucket samples, then _sum and _count, for every series."""
+        samples = []
+        for key, series in self._collect().items():
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(self._bounds, series):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_bound(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, series[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        snapshot = []
+        for key, series in self._collect().items():
+            count = sum(series[:-1])
+            snapshot.append({
+                "labels": dict(zip(self.labels, key)),
+                "count": count,
+                "sum": series[-1],
+                "mean": series[-1] / count if count else None,
+                "buckets": {_format_bound(bound): c for bound, c in zip(self._bounds, series)}
+            })
+        return snapshot
+
+
+class MetricsRegistry:
+    """Named counters and histograms with Prometheus-text and JSON export."""
+
+    def __init__(self, prefix: str = ""):
+        """
+        Create an empty registry.
+
+        Args:
+            prefix: Prepended to every metric name (e.g. "orchestrator_")
+        """
+        self.prefix = prefix
+        self._metrics: Dict[str, Union[Counter, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter family."""
+        return self._register(Counter(self.prefix + name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram family."""
+        return self._register(Histogram(self.prefix + name, help_text, labels, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if existing.kind != metric.kind or existing.labels != metric.labels:
+                    raise ValueError(f"Metric {metric.name} already registered with different type or labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as a JSON-serializable dictionary."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "metrics": {
+                metric.name: {"type": metric.kind, "help": metric.help, "series": metric.snapshot()}
+                for metric in metrics
+            }
+        }
+
+    def write(self, path: Path):
+        """
+        Write the metrics to disk atomically.
+
+        Args:
+            path: Destination; a .json suffix writes the JSON snapshot,
+                anything else Prometheus text (e.g. .prom)
+        """
+        path = Path(path)
+        if path.suffix == ".json":
+            content = json.dumps(self.snapshot(), indent=2)
+        else:
+            content = self.to_prometheus()
+        atomic_write(path, content)
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value (backslash, double quote, newline)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -10,19 +10,34 @@ Author: AI Employee
 Created: 2026-02-09
 """
 
-import os
 import sys
 import json
+import time
+import random
+import hashlib
+import atexit
+import queue
 import logging
-from datetime import datetime, timedelta
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from types import CodeType
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Iterable, List, Optional, Any, Callable, Tuple, Union
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from integrations.events import Event, EventType, event_to_json, event_from_json
+from integrations.templates import compile_template
+from integrations.metrics import MetricsRegistry
+from Logs.vault_io import new_id, atomic_write
+from integrations.scheduler import ContinuationScheduler, SCHEDULER_FILENAME
+
 try:
     from Logs.audit_logger import AuditLogger
 except ImportError:
@@ -32,19 +47,75 @@ except ImportError:
             pass
         def log_external_action(self, *args, **kwargs):
             pass
+        def flush(self):
+            pass
+
+
+# Executions queued or running per worker before process_event blocks (backpressure)
+PENDING_PER_WORKER = 4
+
+# Runtime statistics are written to the state file after this many executions
+# or at most this many seconds after they change (and on exit)
+STATE_FLUSH_BATCH = 50
+STATE_FLUSH_INTERVAL = 5.0
+
+# Seconds between checks of the workflows directory when watching for changes
+RELOAD_INTERVAL = 2.0
+
+# Metrics export (Logs/), rewritten whenever the state file is flushed; a
+# .json name writes a JSON snapshot instead of Prometheus text
+METRICS_FILENAME = "orchestrator_metrics.prom"
+
+# Hidden vault folder where action outputs inside the vault are written
+# before being renamed into place (see _write_item)
+STAGING_DIRNAME = ".staging"
+
+# Retries back off exponentially with full jitter: uniform(0, min(MAX, BASE * 2^n))
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+# Each service may spend at most RETRY_BUDGET_RATIO retries per first attempt,
+# banking up to RETRY_BUDGET_MAX, so an outage cannot multiply its own load
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MAX = 10.0
+
+# Circuit breakers (per service): trip when, over the last BREAKER_WINDOW calls
+# (at least BREAKER_MIN_CALLS), the failure rate or the share of calls slower
+# than BREAKER_SLOW_CALL_SECONDS reaches its threshold; stay open for
+# BREAKER_OPEN_SECONDS, then let one trial call through (half-open)
+BREAKER_WINDOW = 20
+BREAKER_MIN_CALLS = 5
+BREAKER_FAILURE_RATE = 0.5
+BREAKER_SLOW_CALL_SECONDS = 10.0
+BREAKER_SLOW_RATE = 0.8
+BREAKER_OPEN_SECONDS = 30.0
+
+
+# Action handlers run on one shared pool of this many daemon threads, so their
+# timeouts can be enforced; a handler abandoned past its timeout keeps its
+# thread until it returns, and a replacement worker takes its place
+ACTION_WORKERS = 8
+
+
+# Conditions see only the workflow context, no builtins
+CONDITION_GLOBALS = {"__builtins__": {}}
+
+
+@lru_cache(maxsize=None)
+def compile_condition(condition: str) -> CodeType:
+    """
+    Compile a condition expression once; later calls reuse the code object.
+
+    Args:
+        condition: Python expression evaluated against the workflow context
 
+    Returns:
+        Compiled code object
 
-class EventType(Enum):
-    """Types of events that can trigger workflows"""
-    EMAIL_RECEIVED = "email_received"
-    CALENDAR_EVENT = "calendar_event"
-    INVOICE_CREATED = "invoice_created"
-    EXPENSE_RECORDED = "expense_recorded"
-    LINKEDIN_POST = "linkedin_post"
-    FILE_ADDED = "file_added"
-    APPROVAL_RECEIVED = "approval_received"
-    SCHEDULED_TRIGGER = "scheduled_trigger"
-    MANUAL_TRIGGER = "manual_trigger"
+    Raises:
+        SyntaxError: If the expression does not parse
+    """
+    return compile(condition, "<condition>", "eval")
 
 
 class ActionType(Enum):
@@ -61,14 +132,161 @@ class ActionType(Enum):
     WAIT = "wait"
 
 
-@dataclass
-class Event:
-    """Represents a system event that can trigger workflows"""
-    event_type: EventType
-    source: str
-    data: Dict[str, Any]
-    timestamp: str
-    event_id: str
+# Downstream service each action type talks to (retry budgets are per service)
+ACTION_SERVICES = {
+    ActionType.SEND_EMAIL: "email",
+    ActionType.CREATE_CALENDAR_EVENT: "calendar",
+    ActionType.POST_TO_LINKEDIN: "linkedin",
+    ActionType.CREATE_INVOICE: "odoo",
+    ActionType.RECORD_EXPENSE: "odoo",
+}
+
+
+def service_for(action_type: ActionType) -> str:
+    """Service an action depends on ("vault" for local file actions)."""
+    return ACTION_SERVICES.get(action_type, "vault")
+
+
+class ActionTimeout(Exception):
+    """An action handler did not finish within its timeout (it may still finish later)."""
+
+
+class CircuitOpenError(Exception):
+    """A call was short-circuited because its service's breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one downstream service.
+
+    Closed: calls pass and outcomes are recorded in a sliding window.
+    Open: calls fail immediately with CircuitOpenError.
+    Half-open: one trial call passes; success closes, failure reopens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, service: str, on_state_change: Optional[Callable[[str, str, str, Dict], None]] = None):
+        """
+        Initialize the breaker.
+
+        Args:
+            service: Service name (for reporting)
+            on_state_change: Called as (service, old_state, new_state, stats)
+        """
+        self.service = service
+        self.state = self.CLOSED
+        self.on_state_change = on_state_change
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=BREAKER_WINDOW)  # (failed, slow)
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Admit a call or short-circuit it.
+
+        Raises:
+            CircuitOpenError: If the breaker is open (or a trial is running)
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= BREAKER_OPEN_SECONDS:
+                change = self._transition(self.HALF_OPEN)
+            else:
+                change = None
+
+            admitted = self.state == self.CLOSED or (self.state == self.HALF_OPEN and not self._trial_running)
+            if admitted and self.state == self.HALF_OPEN:
+                self._trial_running = True
+
+        self._notify(change)
+        if not admitted:
+            raise CircuitOpenError(f"Circuit open for {self.service}")
+
+    def record(self, failed: bool, seconds: float):
+        """
+        Record the outcome of an admitted call.
+
+        Args:
+            failed: Whether the call raised (including timeouts)
+            seconds: Call duration
+        """
+        slow = seconds >= BREAKER_SLOW_CALL_SECONDS
+
+        with self._lock:
+            change = None
+            if self.state == self.HALF_OPEN:
+                self._trial_running = False
+                change = self._transition(self.OPEN if failed or slow else self.CLOSED)
+            elif self.state == self.CLOSED:
+                self._calls.append((failed, slow))
+                stats = self._stats()
+                if stats["calls"] >= BREAKER_MIN_CALLS and (
+                    stats["failure_rate"] >= BREAKER_FAILURE_RATE or stats["slow_rate"] >= BREAKER_SLOW_RATE
+                ):
+                    change = self._transition(self.OPEN)
+
+        self._notify(change)
+
+    def _stats(self) -> Dict[str, Any]:
+        calls = len(self._calls)
+        return {
+            "calls": calls,
+            "failure_rate": round(sum(failed for failed, _ in self._calls) / calls, 3) if calls else 0.0,
+            "slow_rate": round(sum(slow for _, slow in self._calls) / calls, 3) if calls else 0.0
+        }
+
+    def _transition(self, state: str) -> Optional[Tuple[str, str, Dict]]:
+        """Change state (lock held); returns the change to report after unlocking."""
+        if state == self.state:
+            return None
+
+        old, stats = self.state, self._stats()
+        self.state = state
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+        if state == self.CLOSED:
+            self._calls.clear()
+        return old, state, stats
+
+    def _notify(self, change: Optional[Tuple[str, str, Dict]]):
+        if change and self.on_state_change:
+            self.on_state_change(self.service, *change)
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of first attempts.
+
+    Every first attempt deposits RETRY_BUDGET_RATIO tokens (up to
+    RETRY_BUDGET_MAX); every retry withdraws one.
+    """
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, max_tokens: float = RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            # Rounded so repeated fractional deposits add up to whole tokens
+            self.tokens = min(self.max_tokens, round(self.tokens + self.ratio, 6))
+
+    def withdraw(self) -> bool:
+        """Take one retry token; False if the budget is spent."""
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+def backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retry number attempt + 1 (full jitter)."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
 
 
 @dataclass
@@ -81,6 +299,9 @@ class WorkflowAction:
     on_failure: Optional[str] = None  # Fallback action ID
     retry_count: int = 3
     timeout: int = 30  # seconds
+    idempotent: bool = False  # Safe to retry after a timeout (the timed-out call may still finish)
+    # Compiled parameters (set at load; see integrations/templates.py)
+    render: Optional[Callable[[Dict], Dict]] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -110,12 +331,19 @@ class WorkflowOrchestrator:
     - Audit logging integration
     """
 
-    def __init__(self, vault_path: str):
+    def __init__(self, vault_path: str, max_workers: int = 0, max_pending: Optional[int] = None,
+                 audit_dir: Optional[Path] = None):
         """
         Initialize the orchestrator.
 
         Args:
             vault_path: Path to the AI Employee vault
+            max_workers: Threads for concurrent workflow execution (0 runs
+                workflows serially in the caller, as before)
+            max_pending: Executions queued or running before process_event
+                blocks (default: PENDING_PER_WORKER per worker)
+            audit_dir: Audit log directory (default: the audit logger's,
+                Logs/audit next to the code)
         """
         self.vault_path = Path(vault_path)
         self.workflows_dir = self.vault_path / "integrations" / "workflows"
@@ -123,6 +351,13 @@ class WorkflowOrchestrator:
 
         self.state_file = self.vault_path / "integrations" / "orchestrator_state.json"
         self.log_file = self.vault_path / "Logs" / "integrations.log"
+        self.metrics_file = self.vault_path / "Logs" / METRICS_FILENAME
+
+        # Vault items (approvals, notifications, created files) are written
+        # here, then renamed into watched folders such as Inbox, so watchers
+        # see each one arrive complete
+        self.staging_dir = self.vault_path / STAGING_DIRNAME
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
 
         # Setup logging
         logging.basicConfig(
@@ -136,12 +371,62 @@ class WorkflowOrchestrator:
         self.logger = logging.getLogger("Orchestrator")
 
         # Initialize audit logger
-        self.audit_logger = AuditLogger()
+        self.audit_logger = AuditLogger(audit_dir=audit_dir)
+
+        # Counters and latency histograms (phase "action" label is "" outside actions)
+        self.metrics = MetricsRegistry(prefix="orchestrator_")
+        self._events_total = self.metrics.counter(
+            "events_total", "Events processed", ("event_type",))
+        self._workflow_runs = self.metrics.counter(
+            "workflow_runs_total", "Workflow runs by outcome (success, error, suspended)", ("workflow", "status"))
+        self._workflow_seconds = self.metrics.histogram(
+            "workflow_duration_seconds", "Workflow run latency", ("workflow",))
+        self._action_runs = self.metrics.counter(
+            "action_runs_total", "Action attempts by outcome (success, error, timeout, short_circuited)",
+            ("action", "status"))
+        self._action_retries = self.metrics.counter(
+            "action_retries_total", "Action retries", ("action",))
+        self._phase_seconds = self.metrics.histogram(
+            "phase_duration_seconds",
+            "Latency by phase (trigger_condition, condition, render, handler, audit, state_flush)",
+            ("phase", "action"))
+
+        # Concurrent execution: one lane per workflow keeps its runs in order,
+        # lanes run in parallel on the pool, and the semaphore bounds the backlog
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="workflow") if max_workers > 0 else None
+        self._pending = threading.BoundedSemaphore(max_pending or max(max_workers, 1) * PENDING_PER_WORKER)
+        self._lanes: Dict[str, Deque[Tuple[Callable[[], Any], Future]]] = {}
+        # Without a pool, resumed workflows still need to leave the scheduler thread
+        self._resume_pool = ThreadPoolExecutor(1, thread_name_prefix="resume") if self._pool is None else None
+        self._lock = threading.RLock()
+
+        # Runtime statistics live in state_file, apart from the definitions
+        self._state_lock = threading.Lock()
+        self._state = self._load_state()
+        self._state_dirty = 0
+        self._state_flushed_at = time.monotonic()
+        # Writes pending statistics when no further execution comes to flush them
+        self._flush_timer: Optional[threading.Timer] = None
+        self._batching = 0  # process_events calls in progress (they flush once at the end)
+        atexit.register(self.flush_state)
 
         # Load workflows
         self.workflows: Dict[str, Workflow] = {}
+        # Enabled workflows by trigger event, so dispatch only visits subscribers
+        self._dispatch: Dict[EventType, Dict[str, Workflow]] = {}
+        # Per definition file: (mtime_ns, size, sha256, workflow_id) as last loaded
+        self._sources: Dict[str, Tuple[int, int, str, Optional[str]]] = {}
+        # Files that failed to load, with the reason (bad JSON, unknown type, bad condition)
+        self.load_errors: Dict[str, str] = {}
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
         self.load_workflows()
 
+        # Per-service retry budgets and circuit breakers
+        self._retry_budgets: Dict[str, RetryBudget] = {}
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+
         # Action handlers
         self.action_handlers: Dict[ActionType, Callable] = {
             ActionType.SEND_EMAIL: self._handle_send_email,
@@ -156,153 +441,660 @@ class WorkflowOrchestrator:
             ActionType.WAIT: self._handle_wait,
         }
 
+        # WAIT actions suspend the workflow; its continuation is persisted and
+        # resumed by the scheduler thread (including ones left from a previous run)
+        self.scheduler = ContinuationScheduler(
+            self.vault_path / "integrations" / SCHEDULER_FILENAME, self._on_continuation_due
+        )
+        self.scheduler.start()
+
         self.logger.info("WorkflowOrchestrator initialized")
 
     def load_workflows(self):
         """Load all workflow definitions from workflows directory"""
-        try:
-            workflow_files = list(self.workflows_dir.glob("*.json"))
-
-            for workflow_file in workflow_files:
-                with open(workflow_file, 'r') as f:
-                    data = json.load(f)
-
-                # Convert to Workflow object
-                workflow = Workflow(
-                    workflow_id=data['workflow_id'],
-                    name=data['name'],
-                    description=data['description'],
-                    trigger_event=EventType(data['trigger_event']),
-                    trigger_condition=data.get('trigger_condition'),
-                    actions=[
-                        WorkflowAction(
-                            action_type=ActionType(a['action_type']),
-                            parameters=a['parameters'],
-                            condition=a.get('condition'),
-                            on_success=a.get('on_success'),
-                            on_failure=a.get('on_failure'),
-                            retry_count=a.get('retry_count', 3),
-                            timeout=a.get('timeout', 30)
-                        ) for a in data['actions']
-                    ],
-                    enabled=data.get('enabled', True),
-                    created_at=data.get('created_at'),
-                    last_executed=data.get('last_executed'),
-                    execution_count=data.get('execution_count', 0)
-                )
+        self.reload_workflows()
+        self.logger.info(f"Loaded {len(self.workflows)} workflows")
+
+    def reload_workflows(self) -> Dict[str, List[str]]:
+        """
+        Pick up added, changed and removed workflow definitions.
+
+        Only files whose mtime or size changed are read, and only those whose
+        content hash changed are parsed. All changes are swapped into the
+        dispatch index at once; executions already running keep the
+        definition they started with. A file that fails to parse keeps its
+        previously loaded version.
+
+        Returns:
+            Dictionary of workflow IDs added/updated/removed and file names
+            that failed
+        """
+        changes = {"added": [], "updated": [], "removed": [], "failed": []}
+
+        with self._reload_lock:
+            seen = set()
+            parsed: Dict[str, Tuple[Tuple[int, int, str, Optional[str]], Optional[Workflow]]] = {}
+
+            for workflow_file in sorted(self.workflows_dir.glob("*.json")):
+                name = workflow_file.name
+                seen.add(name)
+                try:
+                    stat = workflow_file.stat()
+                    known = self._sources.get(name)
+                    if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                        continue
+
+                    content = workflow_file.read_bytes()
+                    digest = hashlib.sha256(content).hexdigest()
+                    if known and known[2] == digest:
+                        self._sources[name] = (stat.st_mtime_ns, stat.st_size, digest, known[3])
+                        continue
+
+                    workflow = self._parse_workflow(content)
+                except Exception as e:
+                    if self.load_errors.get(name) != str(e):
+                        self.logger.error(f"Error loading workflow {name}: {e}")
+                    self.load_errors[name] = str(e)
+                    changes["failed"].append(name)
+                    continue
+
+                self.load_errors.pop(name, None)
+                parsed[name] = ((stat.st_mtime_ns, stat.st_size, digest, workflow.workflow_id), workflow)
 
-                self.workflows[workflow.workflow_id] = workflow
-                self.logger.info(f"Loaded workflow: {workflow.name}")
+            removed = [name for name in self._sources if name not in seen]
+            for name in [name for name in self.load_errors if name not in seen]:
+                del self.load_errors[name]
 
-            self.logger.info(f"Loaded {len(self.workflows)} workflows")
+            if not parsed and not removed:
+                return changes
+
+            # Swap everything in at once
+            with self._lock:
+                for name in removed:
+                    workflow_id = self._sources.pop(name)[3]
+                    if workflow_id in self.workflows:
+                        self._unindex_workflow(workflow_id)
+                        changes["removed"].append(workflow_id)
+
+                for name, (source, workflow) in parsed.items():
+                    previous_id = self._sources.get(name, (None,) * 4)[3]
+                    if previous_id and previous_id != workflow.workflow_id:
+                        self._unindex_workflow(previous_id)
+                        changes["removed"].append(previous_id)
+
+                    self._apply_state(workflow)
+                    changes["updated" if workflow.workflow_id in self.workflows else "added"].append(workflow.workflow_id)
+                    self.workflows[workflow.workflow_id] = workflow
+                    self._index_workflow(workflow)
+                    self._sources[name] = source
+
+        for change in ("added", "updated", "removed"):
+            for workflow_id in changes[change]:
+                self.logger.info(f"{change.capitalize()} workflow: {workflow_id}")
+
+        return changes
+
+    def _parse_workflow(self, content: bytes) -> Workflow:
+        """
+        Parse a workflow definition and compile its conditions.
+
+        Args:
+            content: Workflow JSON file content
+
+        Returns:
+            Workflow object
+
+        Raises:
+            ValueError: If a trigger or action condition does not compile
+        """
+        data = json.loads(content)
+
+        # Convert to Workflow object
+        workflow = Workflow(
+            workflow_id=data['workflow_id'],
+            name=data['name'],
+            description=data['description'],
+            trigger_event=EventType(data['trigger_event']),
+            trigger_condition=data.get('trigger_condition'),
+            actions=[
+                WorkflowAction(
+                    action_type=ActionType(a['action_type']),
+                    parameters=a['parameters'],
+                    condition=a.get('condition'),
+                    on_success=a.get('on_success'),
+                    on_failure=a.get('on_failure'),
+                    retry_count=a.get('retry_count', 3),
+                    timeout=a.get('timeout', 30),
+                    idempotent=a.get('idempotent', False)
+                ) for a in data['actions']
+            ],
+            enabled=data.get('enabled', True),
+            created_at=data.get('created_at'),
+            last_executed=data.get('last_executed'),
+            execution_count=data.get('execution_count', 0)
+        )
+
+        # Compile parameter templates once instead of parsing them per execution
+        for action in workflow.actions:
+            action.render = compile_template(action.parameters)
+
+        # Compile conditions now so syntax errors surface at load, not at dispatch
+        conditions = [("trigger_condition", workflow.trigger_condition)] + [
+            (f"action_{idx}.condition", action.condition)
+            for idx, action in enumerate(workflow.actions)
+        ]
+        for name, condition in conditions:
+            if condition:
+                try:
+                    compile_condition(condition)
+                except SyntaxError as e:
+                    raise ValueError(f"invalid {name} {condition!r}: {e.msg}") from e
 
+        return workflow
+
+    def start_watching(self, interval: float = RELOAD_INTERVAL):
+        """
+        Reload changed workflow definitions in a background thread.
+
+        Args:
+            interval: Seconds between directory checks
+        """
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.reload_workflows()
+                except Exception as e:
+                    self.logger.error(f"Error reloading workflows: {e}")
+
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=watch, name="workflow-reload", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        """Stop the background reload thread."""
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Load runtime state (execution statistics) from the state file"""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    state = json.load(f)
+                state.setdefault('workflows', {})
+                return state
+            except Exception as e:
+                self.logger.error(f"Error loading orchestrator state: {e}")
+
+        return {'workflows': {}}
+
+    def _apply_state(self, workflow: Workflow):
+        """Take a workflow's statistics from the state file (seeded from older definitions)"""
+        with self._state_lock:
+            stats = self._state['workflows'].get(workflow.workflow_id)
+            if stats is None:
+                if not workflow.execution_count:
+                    return
+                # Definitions used to carry the counters; move them to the state file
+                self._state['workflows'][workflow.workflow_id] = {
+                    'last_executed': workflow.last_executed,
+                    'execution_count': workflow.execution_count
+                }
+                self._mark_state_dirty()
+                return
+
+            workflow.last_executed = stats.get('last_executed')
+            workflow.execution_count = stats.get('execution_count', 0)
+
+    def _record_execution(self, workflow: Workflow):
+        """Update a workflow's statistics, writing the state file once per batch"""
+        with self._state_lock:
+            # Count from the state, which outlives reloaded definitions
+            stats = self._state['workflows'].get(workflow.workflow_id, {})
+            stats = self._state['workflows'][workflow.workflow_id] = {
+                'last_executed': datetime.now().isoformat(),
+                'execution_count': stats.get('execution_count', workflow.execution_count) + 1
+            }
+            for current in (workflow, self.workflows.get(workflow.workflow_id)):
+                if current is not None:
+                    current.last_executed = stats['last_executed']
+                    current.execution_count = stats['execution_count']
+            self._mark_state_dirty()
+            due = not self._batching and (
+                self._state_dirty >= STATE_FLUSH_BATCH
+                or time.monotonic() - self._state_flushed_at >= STATE_FLUSH_INTERVAL
+            )
+
+        if due:
+            self.flush_state()
+
+    def _mark_state_dirty(self):
+        """Count a state change and make sure it is written within STATE_FLUSH_INTERVAL (state lock held)"""
+        self._state_dirty += 1
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(STATE_FLUSH_INTERVAL, self.flush_state)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush_state(self):
+        """Write pending runtime statistics to the state file, then the metrics export"""
+        with self._state_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._state_dirty:
+                started = time.perf_counter()
+                self._state['updated_at'] = datetime.now().isoformat()
+                try:
+                    atomic_write(self.state_file, json.dumps(self._state, indent=2), fsync=True)
+                except Exception as e:
+                    self.logger.error(f"Error saving orchestrator state: {e}")
+                else:
+                    self._state_dirty = 0
+                    self._state_flushed_at = time.monotonic()
+                    self._phase_seconds.observe(time.perf_counter() - started, "state_flush", "")
+
+        self.write_metrics()
+
+    def write_metrics(self, path: Optional[Path] = None):
+        """
+        Export the metrics registry.
+
+        Args:
+            path: Destination (default: Logs/orchestrator_metrics.prom); a
+                .json suffix writes a JSON snapshot instead of Prometheus text
+        """
+        try:
+            self.metrics.write(path or self.metrics_file)
         except Exception as e:
-            self.logger.error(f"Error loading workflows: {e}")
+            self.logger.error(f"Error writing metrics: {e}")
+
+    def _index_workflow(self, workflow: Workflow):
+        """Place a workflow in the dispatch index under its trigger event (if enabled)"""
+        with self._lock:
+            for event_type, subscribed in self._dispatch.items():
+                if event_type != workflow.trigger_event or not workflow.enabled:
+                    subscribed.pop(workflow.workflow_id, None)
+
+            if workflow.enabled:
+                self._dispatch.setdefault(workflow.trigger_event, {})[workflow.workflow_id] = workflow
+
+    def _unindex_workflow(self, workflow_id: str):
+        """Forget a workflow whose definition was removed"""
+        with self._lock:
+            self.workflows.pop(workflow_id, None)
+            for subscribed in self._dispatch.values():
+                subscribed.pop(workflow_id, None)
+
+    def set_workflow_enabled(self, workflow_id: str, enabled: bool) -> bool:
+        """
+        Enable or disable a workflow and persist the change.
+
+        Args:
+            workflow_id: ID of the workflow
+            enabled: New enabled state
 
-    def process_event(self, event: Event) -> List[str]:
+        Returns:
+            True if the workflow exists
+        """
+        workflow = self.workflows.get(workflow_id)
+        if workflow is None:
+            return False
+
+        workflow.enabled = enabled
+        self._save_workflow(workflow)
+        self.logger.info(f"{'Enabled' if enabled else 'Disabled'} workflow: {workflow.name}")
+        return True
+
+    def enable_workflow(self, workflow_id: str) -> bool:
+        """Enable a workflow"""
+        return self.set_workflow_enabled(workflow_id, True)
+
+    def disable_workflow(self, workflow_id: str) -> bool:
+        """Disable a workflow"""
+        return self.set_workflow_enabled(workflow_id, False)
+
+    def process_event(self, event: Event, wait: bool = True) -> Union[List[str], List[Future]]:
         """
         Process an incoming event and trigger matching workflows.
 
+        With a worker pool, matching workflows run concurrently (runs of the
+        same workflow stay in event order) and this call blocks only while
+        the pool's backlog is full.
+
         Args:
             event: The event to process
+            wait: Wait for the workflows to finish. If False, return one
+                Future per matching workflow instead; each resolves to the
+                workflow ID or raises the workflow's error.
 
         Returns:
-            List of workflow IDs that were executed
+            List of workflow IDs that were executed, or Futures if not waiting
         """
-        executed_workflows = []
-
         self.logger.info(f"Processing event: {event.event_type.value} from {event.source}")
+        self._events_total.inc(event.event_type.value)
 
-        # Find matching workflows
-        for workflow_id, workflow in self.workflows.items():
-            if not workflow.enabled:
-                continue
-
-            # Check if event type matches
-            if workflow.trigger_event != event.event_type:
-                continue
+        # Only workflows subscribed to this event type (copied: saving re-indexes)
+        with self._lock:
+            subscribed = list(self._dispatch.get(event.event_type, {}).items())
+        event_context = None
 
+        futures = []
+        for workflow_id, workflow in subscribed:
             # Check trigger condition if specified
             if workflow.trigger_condition:
                 try:
-                    # Evaluate condition with event as dict
-                    event_context = {'event': asdict(event)}
-                    if not self._evaluate_condition(workflow.trigger_condition, event_context):
+                    # Evaluate condition with event as dict (built once per event)
+                    if event_context is None:
+                        event_context = {'event': asdict(event)}
+                    started = time.perf_counter()
+                    matched = self._evaluate_condition(workflow.trigger_condition, event_context)
+                    self._phase_seconds.observe(time.perf_counter() - started, "trigger_condition", "")
+                    if not matched:
                         continue
                 except Exception as e:
                     self.logger.error(f"Error evaluating trigger condition: {e}")
                     continue
 
-            # Execute workflow
-            try:
-                self.logger.info(f"Triggering workflow: {workflow.name}")
-                self.execute_workflow(workflow, event)
-                executed_workflows.append(workflow_id)
+            self.logger.info(f"Triggering workflow: {workflow.name}")
+            # Reuse the event dict built for the conditions (if any)
+            futures.append(self._submit(workflow, event, event_context and event_context['event']))
 
-                # Update workflow metadata
-                workflow.last_executed = datetime.now().isoformat()
-                workflow.execution_count += 1
-                self._save_workflow(workflow)
+        if not wait:
+            return futures
 
-            except Exception as e:
-                self.logger.error(f"Error executing workflow {workflow.name}: {e}")
-                self.audit_logger.log(
-                    action="workflow_execution",
-                    target=workflow.workflow_id,
-                    status="error",
-                    error=str(e),
-                    details={"event": event.event_type.value}
-                )
+        executed_workflows = []
+        for future in futures:
+            try:
+                executed_workflows.append(future.result())
+            except Exception:
+                pass  # Already logged and audited by _run_workflow
 
         return executed_workflows
 
-    def execute_workflow(self, workflow: Workflow, event: Event):
+    def process_events(self, events: Iterable[Event]) -> List[Dict[str, Any]]:
+        """
+        Process a batch of events (backfills, replays) and wait for them.
+
+        Events are grouped by type, and each subscribed workflow's trigger
+        condition is evaluated over its whole group in one pass. Matching
+        workflows run in event order (concurrently with a worker pool).
+        Statistics are written once at the end and audit entries are
+        flushed together.
+
+        Args:
+            events: Events to process
+
+        Returns:
+            One result per event, in input order:
+            {"event_id": ..., "executed": [workflow IDs], "failed": [workflow IDs]}
+        """
+        events = list(events)
+        results = [{"event_id": event.event_id, "executed": [], "failed": []} for event in events]
+
+        by_type: Dict[EventType, List[int]] = {}
+        for idx, event in enumerate(events):
+            by_type.setdefault(event.event_type, []).append(idx)
+            self._events_total.inc(event.event_type.value)
+
+        with self._lock:
+            subscribed = {event_type: list(self._dispatch.get(event_type, {}).values()) for event_type in by_type}
+
+        # (event index, workflow) pairs to run, and event dicts built for conditions
+        matches: List[Tuple[int, Workflow]] = []
+        event_dicts: Dict[int, Dict] = {}
+        for event_type, indices in by_type.items():
+            contexts = None
+            for workflow in subscribed[event_type]:
+                if not workflow.trigger_condition:
+                    matches.extend((idx, workflow) for idx in indices)
+                    continue
+
+                if contexts is None:
+                    contexts = {idx: {'event': asdict(events[idx])} for idx in indices}
+                    event_dicts.update((idx, context['event']) for idx, context in contexts.items())
+                code = compile_condition(workflow.trigger_condition)
+                for idx, context in contexts.items():
+                    started = time.perf_counter()
+                    try:
+                        if eval(code, CONDITION_GLOBALS, context):
+                            matches.append((idx, workflow))
+                    except Exception as e:
+                        self.logger.error(f"Error evaluating trigger condition for {events[idx].event_id}: {e}")
+                    self._phase_seconds.observe(time.perf_counter() - started, "trigger_condition", "")
+
+        # Stable sort: event order, then dispatch order within an event
+        matches.sort(key=lambda match: match[0])
+        self.logger.info(f"Processing {len(events)} events: {len(matches)} workflow runs")
+
+        with self._state_lock:
+            self._batching += 1
+        try:
+            submitted = [
+                (idx, workflow, self._submit(workflow, events[idx], event_dicts.get(idx)))
+                for idx, workflow in matches
+            ]
+            for idx, workflow, future in submitted:
+                try:
+                    future.result()
+                    results[idx]["executed"].append(workflow.workflow_id)
+                except Exception:
+                    results[idx]["failed"].append(workflow.workflow_id)  # Already logged and audited
+        finally:
+            with self._state_lock:
+                self._batching -= 1
+            self.flush_state()
+            self.audit_logger.flush()
+
+        return results
+
+    def _submit(self, workflow: Workflow, event: Event, event_dict: Optional[Dict] = None) -> Future:
+        """Queue a workflow run on its lane (drained on the pool, or by the caller without one)"""
+        return self._submit_to_lane(
+            workflow.workflow_id, lambda: self._run_workflow(workflow, event, event_dict), self._pool
+        )
+
+    def _submit_to_lane(self, workflow_id: str, run: Callable[[], Any],
+                        pool: Optional[ThreadPoolExecutor]) -> Future:
+        """
+        Queue work for a workflow behind its earlier runs.
+
+        Args:
+            workflow_id: Lane to queue on
+            run: The work (its exceptions are set on the future)
+            pool: Executor draining the lane if it is idle (None drains it in
+                the caller; if the lane is busy, e.g. with a resume, the run
+                waits on it and the returned future is resolved by its drainer)
+
+        Returns:
+            Future resolved with workflow_id once run has finished
+        """
+        future = Future()
+
+        self._pending.acquire()
+        with self._lock:
+            lane = self._lanes.get(workflow_id)
+            start_lane = lane is None
+            if start_lane:
+                lane = self._lanes[workflow_id] = deque()
+            lane.append((run, future))
+
+        if start_lane:
+            if pool is None:
+                self._drain_lane(workflow_id)
+            else:
+                pool.submit(self._drain_lane, workflow_id)
+
+        return future
+
+    def _drain_lane(self, workflow_id: str):
+        """Run queued runs of one workflow in order until its lane is empty"""
+        while True:
+            with self._lock:
+                lane = self._lanes[workflow_id]
+                if not lane:
+                    del self._lanes[workflow_id]
+                    return
+                run, future = lane.popleft()
+
+            try:
+                if future.set_running_or_notify_cancel():
+                    self._resolve(future, workflow_id, run)
+            finally:
+                self._pending.release()
+
+    def _resolve(self, future: Future, workflow_id: str, run: Callable[[], Any]):
+        """Run queued work and settle its future"""
+        try:
+            run()
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(workflow_id)
+
+    def _run_workflow(self, workflow: Workflow, event: Event, event_dict: Optional[Dict] = None):
+        """Execute a matched workflow, record its metadata and audit failures"""
+        try:
+            self.execute_workflow(workflow, event, event_dict=event_dict)
+
+            # Update workflow statistics (the definition is left untouched)
+            self._record_execution(workflow)
+
+        except Exception as e:
+            self.logger.error(f"Error executing workflow {workflow.name}: {e}")
+            self._audit(
+                action="workflow_execution",
+                target=workflow.workflow_id,
+                status="error",
+                error=str(e),
+                details={"event": event.event_type.value}
+            )
+            raise
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker pool.
+
+        Args:
+            wait: Wait for queued and running workflows to finish
+        """
+        self.stop_watching()
+        self.scheduler.stop()
+        for pool in (self._pool, self._resume_pool):
+            if pool is not None:
+                pool.shutdown(wait=wait)
+        self.flush_state()
+        # Flushed; the vault may be gone by exit (e.g. a scratch vault)
+        atexit.unregister(self.flush_state)
+
+    def execute_workflow(self, workflow: Workflow, event: Event,
+                         start_index: int = 0, results: Optional[Dict[str, Any]] = None,
+                         event_dict: Optional[Dict] = None) -> bool:
         """
         Execute a workflow's actions in sequence.
 
+        A WAIT action suspends the workflow: the remaining actions are
+        scheduled to resume after the delay and this call returns.
+
         Args:
             workflow: The workflow to execute
             event: The triggering event
+            start_index: Index of the first action to run (when resuming)
+            results: Results of the actions already run (when resuming)
+            event_dict: The event as a dict, if already built (read-only)
+
+        Returns:
+            True if all actions ran, False if the workflow was suspended
         """
         start_time = datetime.now()
+        started = time.perf_counter()
 
         self.logger.info(f"Executing workflow: {workflow.name}")
 
         # Workflow context (available to all actions)
         context = {
-            'event': asdict(event),
+            'event': event_dict if event_dict is not None else asdict(event),
             'workflow': {
                 'id': workflow.workflow_id,
                 'name': workflow.name
             },
-            'results': {}  # Store action results
+            'results': dict(results or {})  # Store action results
         }
 
+        # Reported in the audit record
+        counters = {"retries": 0, "timeouts": 0, "retries_denied": 0, "short_circuited": 0}
+
         try:
             # Execute each action
             for idx, action in enumerate(workflow.actions):
+                if idx < start_index:
+                    continue
                 action_id = f"action_{idx}"
 
                 # Check action condition
                 if action.condition:
-                    if not self._evaluate_condition(action.condition, context):
+                    condition_started = time.perf_counter()
+                    matched = self._evaluate_condition(action.condition, context)
+                    self._phase_seconds.observe(
+                        time.perf_counter() - condition_started, "condition", action.action_type.value)
+                    if not matched:
                         self.logger.info(f"Skipping action {action_id}: condition not met")
                         continue
 
-                # Execute action with retries
+                # Suspend instead of sleeping; the scheduler resumes at the next action
+                if action.action_type == ActionType.WAIT:
+                    parameters = action.render(context) if action.render else self._resolve_parameters(action.parameters, context)
+                    duration = float(parameters.get('duration', 1))
+                    if duration <= 0:
+                        context['results'][action_id] = {"status": "waited", "duration": 0}
+                        continue
+                    context['results'][action_id] = {"status": "scheduled", "duration": duration}
+                    self._suspend(workflow, event, idx + 1, context['results'], duration, counters, start_time)
+                    self._record_run(workflow, "suspended", started)
+                    return False
+
+                # Execute action with retries (backing off, within the service's budget)
+                budget = self._retry_budget(service_for(action.action_type))
+                budget.deposit()
                 success = False
+                action_type = action.action_type.value
                 for attempt in range(action.retry_count):
                     try:
                         result = self._execute_action(action, context)
                         context['results'][action_id] = result
+                        self._action_runs.inc(action_type, "success")
                         success = True
                         break
+                    except CircuitOpenError:
+                        # Fail fast: retrying an open circuit only adds latency
+                        counters["short_circuited"] += 1
+                        self._action_runs.inc(action_type, "short_circuited")
+                        raise
                     except Exception as e:
-                        self.logger.error(f"Action {action_id} attempt {attempt + 1} failed: {e}")
-                        if attempt < action.retry_count - 1:
-                            continue
+                        if isinstance(e, ActionTimeout):
+                            counters["timeouts"] += 1
+                            self._action_runs.inc(action_type, "timeout")
                         else:
+                            self._action_runs.inc(action_type, "error")
+                        self.logger.error(f"Action {action_id} attempt {attempt + 1} failed: {e}")
+                        if attempt >= action.retry_count - 1:
+                            raise
+                        if isinstance(e, ActionTimeout) and not action.idempotent:
+                            # The abandoned call may still complete; another would repeat its side effects
+                            self.logger.error(f"Not retrying {action_id}: it timed out and is not marked idempotent")
+                            raise
+                        if not budget.withdraw():
+                            counters["retries_denied"] += 1
+                            self.logger.error(f"Retry budget for {service_for(action.action_type)} exhausted")
                             raise
+                        counters["retries"] += 1
+                        self._action_retries.inc(action_type)
+                        time.sleep(backoff_delay(attempt))
 
                 if not success and action.on_failure:
                     self.logger.info(f"Executing failure handler: {action.on_failure}")
@@ -310,32 +1102,140 @@ class WorkflowOrchestrator:
 
             # Log successful execution
             duration = (datetime.now() - start_time).total_seconds() * 1000
-            self.audit_logger.log(
+            self._audit(
                 action="workflow_execution",
                 target=workflow.workflow_id,
                 status="success",
                 duration_ms=int(duration),
                 details={
                     "event": event.event_type.value,
-                    "actions_executed": len(workflow.actions)
+                    "actions_executed": len(workflow.actions),
+                    **counters
                 }
             )
 
             self.logger.info(f"Workflow {workflow.name} completed successfully")
+            self._record_run(workflow, "success", started)
+            return True
 
         except Exception as e:
             self.logger.error(f"Workflow {workflow.name} failed: {e}")
             duration = (datetime.now() - start_time).total_seconds() * 1000
-            self.audit_logger.log(
+            self._audit(
                 action="workflow_execution",
                 target=workflow.workflow_id,
                 status="error",
                 error=str(e),
                 duration_ms=int(duration),
-                details={"event": event.event_type.value}
+                details={"event": event.event_type.value, **counters}
             )
+            self._record_run(workflow, "error", started)
             raise
 
+    def _record_run(self, workflow: Workflow, status: str, started: float):
+        """Count a workflow run (or resumed segment) and record its latency"""
+        self._workflow_runs.inc(workflow.workflow_id, status)
+        self._workflow_seconds.observe(time.perf_counter() - started, workflow.workflow_id)
+
+    def _audit(self, **entry):
+        """Write an audit entry, timed as the "audit" phase"""
+        started = time.perf_counter()
+        self.audit_logger.log(**entry)
+        self._phase_seconds.observe(time.perf_counter() - started, "audit", "")
+
+    def _suspend(self, workflow: Workflow, event: Event, next_index: int, results: Dict[str, Any],
+                 delay: float, counters: Dict[str, int], start_time: datetime):
+        """Persist the rest of a workflow to run after delay seconds"""
+        continuation_id = self.scheduler.schedule(delay, {
+            'workflow_id': workflow.workflow_id,
+            'event': event_to_json(event),
+            'next_action': next_index,
+            'results': results,
+            'definition': _actions_hash(workflow)
+        })
+
+        self.logger.info(f"Workflow {workflow.name} waiting {delay}s (continuation {continuation_id})")
+        duration = (datetime.now() - start_time).total_seconds() * 1000
+        self._audit(
+            action="workflow_execution",
+            target=workflow.workflow_id,
+            status="pending",
+            duration_ms=int(duration),
+            details={
+                "event": event.event_type.value,
+                "suspended_at": f"action_{next_index - 1}",
+                "resume_in_seconds": delay,
+                "continuation_id": continuation_id,
+                **counters
+            }
+        )
+
+    def _on_continuation_due(self, continuation_id: int, payload: Dict[str, Any]):
+        """Resume a suspended workflow on its lane, behind runs already queued for it"""
+        self._submit_to_lane(
+            payload['workflow_id'], lambda: self._resume(continuation_id, payload),
+            self._pool or self._resume_pool
+        )
+
+    def _resume(self, continuation_id: int, payload: Dict[str, Any]):
+        """Run the remaining actions of a suspended workflow"""
+        try:
+            workflow = self.workflows.get(payload['workflow_id'])
+            if workflow is None:
+                self.logger.error(f"Dropping continuation {continuation_id}: workflow {payload['workflow_id']} no longer loaded")
+                return
+            if payload.get('definition', _actions_hash(workflow)) != _actions_hash(workflow):
+                # next_action indexes the old action list; resuming could skip or repeat steps
+                self.logger.error(f"Dropping continuation {continuation_id}: workflow {workflow.workflow_id} "
+                                  f"was changed while it waited")
+                self._audit(
+                    action="workflow_execution",
+                    target=workflow.workflow_id,
+                    status="error",
+                    error="Workflow definition changed while suspended",
+                    details={"continuation_id": continuation_id, "next_action": payload['next_action']}
+                )
+                return
+
+            self.execute_workflow(
+                workflow,
+                event_from_json(payload['event']),
+                start_index=payload['next_action'],
+                results=payload['results']
+            )
+        except Exception as e:
+            # execute_workflow has audited the failure; a continuation runs at most once
+            self.logger.error(f"Error resuming continuation {continuation_id}: {e}")
+        finally:
+            self.scheduler.complete(continuation_id)
+
+    def _circuit_breaker(self, service: str) -> CircuitBreaker:
+        """Circuit breaker shared by all actions against a service"""
+        with self._lock:
+            breaker = self.circuit_breakers.get(service)
+            if breaker is None:
+                breaker = self.circuit_breakers[service] = CircuitBreaker(service, self._on_breaker_change)
+            return breaker
+
+    def _on_breaker_change(self, service: str, old_state: str, new_state: str, stats: Dict):
+        """Log and audit a circuit breaker changing state"""
+        log = self.logger.warning if new_state == CircuitBreaker.OPEN else self.logger.info
+        log(f"Circuit breaker for {service}: {old_state} -> {new_state}")
+        self._audit(
+            action="circuit_breaker",
+            target=f"{service}:circuit",
+            status=new_state,
+            details={"service": service, "from": old_state, **stats}
+        )
+
+    def _retry_budget(self, service: str) -> RetryBudget:
+        """Retry budget shared by all actions against a service"""
+        with self._lock:
+            budget = self._retry_budgets.get(service)
+            if budget is None:
+                budget = self._retry_budgets[service] = RetryBudget()
+            return budget
+
     def _execute_action(self, action: WorkflowAction, context: Dict) -> Any:
         """Execute a single action"""
         handler = self.action_handlers.get(action.action_type)
@@ -343,51 +1243,60 @@ class WorkflowOrchestrator:
         if not handler:
             raise ValueError(f"No handler for action type: {action.action_type}")
 
+        action_type = action.action_type.value
+
         # Replace placeholders in parameters with context values
-        parameters = self._resolve_parameters(action.parameters, context)
+        started = time.perf_counter()
+        if action.render is not None:
+            parameters = action.render(context)
+        else:
+            parameters = self._resolve_parameters(action.parameters, context)
+        self._phase_seconds.observe(time.perf_counter() - started, "render", action_type)
 
         self.logger.info(f"Executing action: {action.action_type.value}")
 
-        return handler(parameters, context)
+        # WAIT is a deliberate delay, not a service call that can fail or hang
+        if action.action_type == ActionType.WAIT:
+            return handler(parameters, context)
+
+        breaker = self._circuit_breaker(service_for(action.action_type))
+        breaker.allow()
+
+        start = time.monotonic()
+        try:
+            if action.timeout:
+                result = _call_with_timeout(handler, (parameters, context), action.timeout, action_type)
+            else:
+                result = handler(parameters, context)
+        except Exception:
+            elapsed = time.monotonic() - start
+            breaker.record(failed=True, seconds=elapsed)
+            self._phase_seconds.observe(elapsed, "handler", action_type)
+            raise
+
+        elapsed = time.monotonic() - start
+        breaker.record(failed=False, seconds=elapsed)
+        self._phase_seconds.observe(elapsed, "handler", action_type)
+        return result
 
     def _evaluate_condition(self, condition: str, context: Dict) -> bool:
         """Safely evaluate a condition expression"""
         try:
-            # Limited eval with only safe context
-            return eval(condition, {"__builtins__": {}}, context)
+            # Limited eval with only safe context, on the cached code object
+            return eval(compile_condition(condition), CONDITION_GLOBALS, context)
         except Exception as e:
             self.logger.error(f"Error evaluating condition '{condition}': {e}")
             return False
 
     def _resolve_parameters(self, parameters: Dict, context: Dict) -> Dict:
         """Resolve template variables in parameters"""
-        resolved = {}
-
-        for key, value in parameters.items():
-            if isinstance(value, str) and value.startswith("{{") and value.endswith("}}"):
-                # Template variable: {{event.data.subject}}
-                var_path = value[2:-2].strip()
-                resolved[key] = self._get_nested_value(context, var_path)
-            else:
-                resolved[key] = value
-
-        return resolved
-
-    def _get_nested_value(self, data: Dict, path: str) -> Any:
-        """Get value from nested dict using dot notation"""
-        keys = path.split('.')
-        value = data
-
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-            else:
-                return None
-
-        return value
+        return compile_template(parameters)(context)
 
     def _save_workflow(self, workflow: Workflow):
-        """Save workflow to file"""
+        """Save workflow definition to file (skipped if unchanged)"""
+        self.workflows[workflow.workflow_id] = workflow
+        self._index_workflow(workflow)
+
         workflow_file = self.workflows_dir / f"{workflow.workflow_id}.json"
 
         data = {
@@ -404,17 +1313,41 @@ class WorkflowOrchestrator:
                     'on_success': a.on_success,
                     'on_failure': a.on_failure,
                     'retry_count': a.retry_count,
-                    'timeout': a.timeout
+                    'timeout': a.timeout,
+                    'idempotent': a.idempotent
                 } for a in workflow.actions
             ],
             'enabled': workflow.enabled,
-            'created_at': workflow.created_at,
-            'last_executed': workflow.last_executed,
-            'execution_count': workflow.execution_count
+            'created_at': workflow.created_at
         }
 
-        with open(workflow_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        content = json.dumps(data, indent=2)
+        try:
+            if workflow_file.read_text() == content:
+                return
+        except OSError:
+            pass
+
+        atomic_write(workflow_file, content, fsync=True)
+
+        # Our own write is not a change for reload_workflows to pick up
+        stat = workflow_file.stat()
+        with self._reload_lock:
+            self._sources[workflow_file.name] = (
+                stat.st_mtime_ns, stat.st_size,
+                hashlib.sha256(content.encode()).hexdigest(), workflow.workflow_id
+            )
+
+    def _write_item(self, path: Path, content: str):
+        """Write an action output, appearing complete in one step"""
+        # The final rename must stay on one filesystem, so paths outside the
+        # vault (absolute create_file paths) are staged next to themselves
+        try:
+            path.resolve().relative_to(self.vault_path.resolve())
+            tmp_dir = self.staging_dir
+        except ValueError:
+            tmp_dir = None
+        atomic_write(path, content, tmp_dir=tmp_dir)
 
     # Action Handlers
 
@@ -423,7 +1356,7 @@ class WorkflowOrchestrator:
         self.logger.info(f"Sending email to: {params.get('to')}")
 
         # Create email file in Pending_Approval
-        email_file = self.vault_path / "Pending_Approval" / f"EMAIL_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.md"
+        email_file = self.vault_path / "Pending_Approval" / f"EMAIL_{new_id()}.md"
 
         content = f"""# Email Draft
 
@@ -440,7 +1373,7 @@ class WorkflowOrchestrator:
 *Awaiting approval to send*
 """
 
-        email_file.write_text(content)
+        self._write_item(email_file, content)
 
         self.audit_logger.log_external_action(
             service="email",
@@ -458,7 +1391,7 @@ class WorkflowOrchestrator:
         self.logger.info(f"Creating calendar event: {params.get('title')}")
 
         # Create calendar event file
-        event_file = self.vault_path / "Pending_Approval" / f"CALENDAR_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.md"
+        event_file = self.vault_path / "Pending_Approval" / f"CALENDAR_{new_id()}.md"
 
         content = f"""# Calendar Event
 
@@ -476,7 +1409,7 @@ class WorkflowOrchestrator:
 *Awaiting approval to create*
 """
 
-        event_file.write_text(content)
+        self._write_item(event_file, content)
 
         return {"status": "pending_approval", "file": str(event_file)}
 
@@ -485,7 +1418,7 @@ class WorkflowOrchestrator:
         self.logger.info("Creating LinkedIn post draft")
 
         # Create LinkedIn post file
-        post_file = self.vault_path / "Pending_Approval" / f"LINKEDIN_POST_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.md"
+        post_file = self.vault_path / "Pending_Approval" / f"LINKEDIN_POST_{new_id()}.md"
 
         content = f"""# LinkedIn Post Draft
 
@@ -503,7 +1436,7 @@ class WorkflowOrchestrator:
 *Awaiting approval to post*
 """
 
-        post_file.write_text(content)
+        self._write_item(post_file, content)
 
         self.audit_logger.log_external_action(
             service="linkedin",
@@ -522,7 +1455,7 @@ class WorkflowOrchestrator:
 
         # This would call Odoo MCP server
         # For now, create approval request
-        invoice_file = self.vault_path / "Pending_Approval" / f"INVOICE_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.md"
+        invoice_file = self.vault_path / "Pending_Approval" / f"INVOICE_{new_id()}.md"
 
         items_text = "\n".join([
             f"- {item['name']}: {item['quantity']} x ${item['price']}"
@@ -543,7 +1476,7 @@ class WorkflowOrchestrator:
 *Awaiting approval to create in Odoo*
 """
 
-        invoice_file.write_text(content)
+        self._write_item(invoice_file, content)
 
         self.audit_logger.log_external_action(
             service="odoo",
@@ -569,7 +1502,7 @@ class WorkflowOrchestrator:
         content = params.get('content', '')
 
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_text(content)
+        self._write_item(file_path, content)
 
         self.logger.info(f"Created file: {file_path}")
 
@@ -579,7 +1512,7 @@ class WorkflowOrchestrator:
         """Handle approval request"""
         self.logger.info(f"Requesting approval: {params.get('title')}")
 
-        approval_file = self.vault_path / "Pending_Approval" / f"APPROVAL_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.md"
+        approval_file = self.vault_path / "Pending_Approval" / f"APPROVAL_{new_id()}.md"
 
         content = f"""# Approval Request
 
@@ -591,13 +1524,13 @@ class WorkflowOrchestrator:
 *Requested*: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
 
-        approval_file.write_text(content)
+        self._write_item(approval_file, content)
 
         return {"status": "pending", "file": str(approval_file)}
 
     def _handle_send_notification(self, params: Dict, context: Dict) -> Dict:
         """Handle notification"""
-        notification_file = self.vault_path / "Inbox" / f"NOTIFICATION_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.md"
+        notification_file = self.vault_path / "Inbox" / f"NOTIFICATION_{new_id()}.md"
 
         content = f"""# Notification
 
@@ -610,7 +1543,7 @@ class WorkflowOrchestrator:
 *Time*: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
 
-        notification_file.write_text(content)
+        self._write_item(notification_file, content)
 
         self.logger.info(f"Sent notification: {params.get('title')}")
 
@@ -631,14 +1564,125 @@ class WorkflowOrchestrator:
         return {"status": "executed", "script": script}
 
     def _handle_wait(self, params: Dict, context: Dict) -> Dict:
-        """Handle wait action"""
-        import time
-        duration = params.get('duration', 1)
+        """Handle wait action (only used directly: workflows suspend on WAIT instead)"""
+        duration = max(float(params.get('duration', 1)), 0)
         self.logger.info(f"Waiting for {duration} seconds")
         time.sleep(duration)
         return {"status": "waited", "duration": duration}
 
 
+class _ActionCall:
+    """One handler call queued on the action pool."""
+
+    def __init__(self, func: Callable, args: tuple):
+        self.func = func
+        self.args = args
+        self.future = Future()
+        self.started = threading.Event()
+        self.abandoned = False
+
+
+class _ActionPool:
+    """
+    Daemon threads running action handlers, ACTION_WORKERS of them available.
+
+    Unlike ThreadPoolExecutor, a hung handler does not hold up interpreter
+    exit. A call abandoned past its timeout keeps its thread until it
+    returns, so abandon() starts a replacement worker and the abandoned
+    one exits when its call does. Threads start on first use.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._queue: "queue.SimpleQueue[_ActionCall]" = queue.SimpleQueue()
+        self._started = False
+        self._lock = threading.Lock()
+        self._spawned = 0
+
+    def submit(self, func: Callable, args: tuple) -> _ActionCall:
+        """Queue func(*args); call.started is set once a worker runs it."""
+        if not self._started:
+            with self._lock:
+                if not self._started:
+                    for _ in range(self.workers):
+                        self._spawn()
+                    self._started = True
+
+        call = _ActionCall(func, args)
+        self._queue.put(call)
+        return call
+
+    def abandon(self, call: _ActionCall) -> bool:
+        """
+        Stop waiting for a running call and replace its worker.
+
+        Returns:
+            False if the call finished meanwhile (its result is available)
+        """
+        with self._lock:
+            if call.future.done():
+                return False
+            call.abandoned = True
+            self._spawn()
+        return True
+
+    def _spawn(self):
+        self._spawned += 1
+        threading.Thread(target=self._work, name=f"action-{self._spawned}", daemon=True).start()
+
+    def _work(self):
+        while True:
+            call = self._queue.get()
+            call.future.set_running_or_notify_cancel()
+            call.started.set()
+            try:
+                result, error = call.func(*call.args), None
+            except BaseException as e:
+                result, error = None, e
+
+            with self._lock:
+                if error is None:
+                    call.future.set_result(result)
+                else:
+                    call.future.set_exception(error)
+                if call.abandoned:
+                    return  # A replacement worker already took this one's place
+
+
+_action_pool = _ActionPool(ACTION_WORKERS)
+
+
+def _actions_hash(workflow: Workflow) -> str:
+    """Fingerprint of a workflow's action list (what a continuation's index points into)."""
+    actions = [
+        [a.action_type.value, a.parameters, a.condition, a.retry_count, a.timeout, a.idempotent]
+        for a in workflow.actions
+    ]
+    return hashlib.sha256(json.dumps(actions, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _call_with_timeout(func: Callable, args: tuple, timeout: float, name: str) -> Any:
+    """
+    Run func(*args) on the shared action pool and wait at most timeout seconds
+    once it has started (waiting for a free worker does not count).
+
+    Threads cannot be killed, so a call past its deadline is abandoned: it
+    finishes (or hangs) in the background, and may still complete its side
+    effects (write its file, send its email) after the timeout was reported.
+
+    Raises:
+        ActionTimeout: If the call did not finish in time
+    """
+    call = _action_pool.submit(func, args)
+    call.started.wait()
+    try:
+        return call.future.result(timeout=timeout)
+    except FutureTimeoutError:
+        if not _action_pool.abandon(call):
+            return call.future.result()  # Finished right at the deadline
+        raise ActionTimeout(f"{name} timed out after {timeout}s") from None
+
+
 def main():
     """Example usage"""
     vault_path = "/mnt/f/Maryam/Quarter_4/Ai_Employee_Vault"
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Continuation Scheduler
+
+Persistent timer heap for suspended workflows. A WAIT action stores the
+rest of its workflow as a continuation due at a future time; one thread
+sleeps until the earliest one is due and hands it back to the orchestrator.
+Outstanding continuations cost a heap entry and a SQLite row, not a thread,
+and survive a restart (overdue ones fire as soon as the scheduler starts).
+
+Every process that builds an orchestrator (watchers, the queue consumer,
+CLI runs) shares the store, so a due continuation is claimed with a lease
+before it is handed over: only the process whose claim succeeds resumes it.
+If that process dies first, the claim expires after CLAIM_LEASE_SECONDS
+and another process (or the restarted one) resumes it.
+
+Gold Tier Feature #5
+"""
+
+import os
+import json
+import time
+import heapq
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCHEDULER_FILENAME = "scheduler.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS continuations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    due REAL NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    claimed_by TEXT,
+    lease_until REAL
+);
+"""
+
+# Columns added after the first release (added to older stores on open)
+CLAIM_COLUMNS = {"claimed_by": "TEXT", "lease_until": "REAL"}
+
+# How long a claimed continuation stays reserved for the claiming process;
+# longer than any resumed workflow should take
+CLAIM_LEASE_SECONDS = 15 * 60
+
+
+class ContinuationScheduler:
+    """Heap-ordered, SQLite-persisted timers with a single dispatch thread."""
+
+    def __init__(self, path: Path, on_due: Callable[[int, Dict[str, Any]], None]):
+        """
+        Open (or create) the scheduler store.
+
+        Args:
+            path: SQLite database file
+            on_due: Called as (continuation_id, payload) when a continuation is
+                due and claimed by this process; call complete(continuation_id)
+                once it has been handled
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.on_due = on_due
+
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(continuations)")}
+        for column, column_type in CLAIM_COLUMNS.items():
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE continuations ADD COLUMN {column} {column_type}")
+
+        # Identifies this scheduler's claims
+        self.owner = f"{os.getpid()}_{os.urandom(4).hex()}"
+
+        self._heap: List[Tuple[float, int]] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def start(self):
+        """Load outstanding continuations and start the dispatch thread."""
+        if self._thread is not None:
+            return
+
+        with self._cond:
+            # Ones claimed by another process are retried when the claim expires
+            self._heap = [tuple(row) for row in self._conn.execute(
+                "SELECT MAX(due, COALESCE(lease_until, 0)), id FROM continuations"
+            )]
+            heapq.heapify(self._heap)
+            self._stopping = False
+
+        self._thread = threading.Thread(target=self._run, name="continuation-scheduler", daemon=True)
+        self._thread.start()
+
+    def schedule(self, delay: float, payload: Dict[str, Any]) -> int:
+        """
+        Persist a continuation due after delay seconds.
+
+        Args:
+            delay: Seconds from now
+            payload: JSON-serializable state needed to resume
+
+        Returns:
+            Continuation ID
+        """
+        now = time.time()
+        due = now + max(delay, 0)
+
+        with self._cond:
+            cursor = self._conn.execute(
+                "INSERT INTO continuations (due, payload, created_at) VALUES (?, ?, ?)",
+                (due, json.dumps(payload, default=str), now)
+            )
+            heapq.heappush(self._heap, (due, cursor.lastrowid))
+            # Wake the thread if this is now the earliest timer
+            if self._heap[0][1] == cursor.lastrowid:
+                self._cond.notify()
+
+        return cursor.lastrowid
+
+    def complete(self, continuation_id: int):
+        """Forget a continuation that has been handled."""
+        with self._cond:
+            self._conn.execute("DELETE FROM continuations WHERE id = ?", (continuation_id,))
+
+    def pending(self) -> int:
+        """Number of outstanding continuations (including ones being handled)."""
+        with self._cond:
+            return self._conn.execute("SELECT COUNT(*) FROM continuations").fetchone()[0]
+
+    def stop(self):
+        """Stop dispatching; outstanding continuations stay on disk."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    now = time.time()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._cond.wait(self._heap[0][0] - now if self._heap else None)
+
+                if self._stopping:
+                    return
+
+                _, continuation_id = heapq.heappop(self._heap)
+                row = self._conn.execute(
+                    "SELECT payload FROM continuations WHERE id = ?", (continuation_id,)
+                ).fetchone()
+                if row is None:
+                    continue  # Completed meanwhile
+
+                if not self._claim(continuation_id, now):
+                    # Another process is resuming it; look again once its claim expires
+                    lease = self._conn.execute(
+                        "SELECT lease_until FROM continuations WHERE id = ?", (continuation_id,)
+                    ).fetchone()
+                    if lease is not None:
+                        heapq.heappush(self._heap, (lease[0] or now, continuation_id))
+                    continue
+
+            try:
+                self.on_due(continuation_id, json.loads(row[0]))
+            except Exception as e:
+                print(f"Error dispatching continuation {continuation_id}: {e}")
+                with self._cond:
+                    heapq.heappush(self._heap, (now + CLAIM_LEASE_SECONDS, continuation_id))
+
+    def _claim(self, continuation_id: int, now: float) -> bool:
+        """Reserve a continuation for this process, unless another holds a live claim."""
+        cursor = self._conn.execute(
+            "UPDATE continuations SET claimed_by = ?, lease_until = ? "
+            "WHERE id = ? AND (claimed_by IS NULL OR lease_until < ?)",
+            (self.owner, now + CLAIM_LEASE_SECONDS, continuation_id, now)
+        )
+        return cursor.rowcount == 1
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Workflow Parameter Templates
+
+Compiles action parameters containing {{path}} placeholders into render
+functions once, so executing an action only walks pre-split paths and joins
+pre-split literals.
+
+- "{{event.data.amount}}" on its own renders the value itself (any type)
+- "Amount: ${{event.data.amount}}" interpolates; missing values render as ""
+- Dicts and lists are rendered recursively; values without placeholders are
+  returned as-is
+
+Gold Tier Feature #5
+"""
+
+import re
+from typing import Any, Callable, Dict, Tuple
+
+Renderer = Callable[[Dict[str, Any]], Any]
+
+PLACEHOLDER = re.compile(r"\{\{\s*([^{}]*?)\s*\}\}")
+
+
+def compile_template(value: Any) -> Renderer:
+    """
+    Compile a parameter value (string, dict, list or constant).
+
+    Args:
+        value: Parameter value from a workflow definition
+
+    Returns:
+        Function rendering the value against a workflow context
+    """
+    return _compile(value)[1]
+
+
+def _compile(value: Any) -> Tuple[bool, Renderer]:
+    """Compile a value, reporting whether it is constant."""
+    if isinstance(value, str):
+        return _compile_string(value)
+
+    if isinstance(value, dict):
+        compiled = [(key, _compile(item)) for key, item in value.items()]
+        if all(constant for _, (constant, _) in compiled):
+            return _constant(value)
+        renderers = [(key, render) for key, (_, render) in compiled]
+        return False, lambda context: {key: render(context) for key, render in renderers}
+
+    if isinstance(value, list):
+        compiled = [_compile(item) for item in value]
+        if all(constant for constant, _ in compiled):
+            return _constant(value)
+        renderers = [render for _, render in compiled]
+        return False, lambda context: [render(context) for render in renderers]
+
+    return _constant(value)
+
+
+def _compile_string(value: str) -> Tuple[bool, Renderer]:
+    # split() alternates literal text and placeholder paths
+    parts = PLACEHOLDER.split(value)
+    if len(parts) == 1:
+        return _constant(value)
+
+    if len(parts) == 3 and not parts[0] and not parts[2]:
+        # The whole value is one placeholder: keep the value's type
+        return False, _accessor(parts[1])
+
+    pieces = [
+        (part, None) if idx % 2 == 0 else (None, _accessor(part))
+        for idx, part in enumerate(parts)
+        if part or idx % 2
+    ]
+
+    def render(context: Dict[str, Any]) -> str:
+        out = []
+        for literal, get in pieces:
+            if get is None:
+                out.append(literal)
+            else:
+                resolved = get(context)
+                out.append("" if resolved is None else str(resolved))
+        return "".join(out)
+
+    return False, render
+
+
+def _accessor(path: str) -> Renderer:
+    """Look up a dotted path (event.data.subject); None once it leaves dicts."""
+    keys = tuple(path.split("."))
+
+    def get(context: Dict[str, Any]) -> Any:
+        value = context
+        for key in keys:
+            if isinstance(value, dict):
+                value = value.get(key)
+            else:
+                return None
+        return value
+
+    return get
+
+
+def _constant(value: Any) -> Tuple[bool, Renderer]:
+    return True, lambda context: value
@@ -0,0 +1,253 @@
+"""
+Watcher Benchmark - Inbox observers and the ingest pipeline.
+
+latency: for each observer and Inbox size, fills a scratch Inbox with that
+many files, starts the observer, measures the CPU it burns while nothing
+happens, then drops probe files one at a time and measures how long each
+takes to be seen.
+
+bulk: drops a batch of files into a scratch Inbox, either by copying them in
+(as a file manager does; ingestion can only keep pace with the copy) or by
+moving them in at once (the whole batch is waiting, which measures the
+pipeline itself), and reports how long settle, copy, metadata and hand-off
+take for all of them, per copy worker count.
+
+ingest: puts one file of each size into Needs_Action with every ingest mode
+(and shutil.copy2, the previous behavior) and reports the time taken and the
+bytes of file data written (as reported, and as counted by the kernel in
+/proc/self/io where available).
+
+Usage:
+    python watcher_benchmark.py
+    python watcher_benchmark.py --sizes 10,1000 --observers inotify --idle 5
+    python watcher_benchmark.py --benchmark bulk --files 500 --file-kb 1024 --copy-workers 1,4,8
+    python watcher_benchmark.py --benchmark bulk --drop move
+    python watcher_benchmark.py --benchmark ingest --ingest-sizes-mb 1,64,512,2048
+"""
+
+import os
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+from typing import Optional
+from watchdog.events import FileSystemEventHandler
+
+import filesystem_watcher
+from filesystem_watcher import INGEST_MODES, OBSERVER_MODES, POLL_INTERVAL, DropHandler, ingest_file, make_observer
+
+DEFAULT_SIZES = "10,1000,100000"
+DEFAULT_OBSERVERS = "polling,inotify"
+PROBE_TIMEOUT = 30
+
+
+class ProbeHandler(FileSystemEventHandler):
+    """Records when each probe file is first seen."""
+
+    def __init__(self):
+        self.seen = {}
+        self.arrived = threading.Condition()
+
+    def on_created(self, event):
+        name = Path(event.src_path).name
+        if name.startswith("probe_"):
+            with self.arrived:
+                self.seen.setdefault(name, time.perf_counter())
+                self.arrived.notify_all()
+
+    def wait_for(self, name: str, timeout: float):
+        with self.arrived:
+            self.arrived.wait_for(lambda: name in self.seen, timeout)
+            return self.seen.get(name)
+
+
+def fill_inbox(inbox: Path, count: int):
+    inbox.mkdir(parents=True)
+    for i in range(count):
+        (inbox / f"seed_{i:06d}.txt").write_bytes(b"x")
+
+
+def run_case(mode: str, size: int, probes: int, idle_seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        inbox = Path(scratch) / "Inbox"
+        fill_inbox(inbox, size)
+
+        handler = ProbeHandler()
+        observer, description = make_observer(mode, inbox)
+        start = time.perf_counter()
+        observer.schedule(handler, str(inbox), recursive=False)
+        observer.start()
+        startup = time.perf_counter() - start
+
+        # Idle cost: CPU time of this process (all threads) while nothing changes
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        time.sleep(idle_seconds)
+        idle_cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start) * 100
+
+        latencies = []
+        for i in range(probes):
+            # Drop at a random point of the polling cycle, as real files arrive
+            time.sleep(random.uniform(0, POLL_INTERVAL))
+            name = f"probe_{i}.txt"
+            written = time.perf_counter()
+            (inbox / name).write_bytes(b"probe")
+            seen = handler.wait_for(name, PROBE_TIMEOUT)
+            latencies.append(seen - written if seen is not None else float("inf"))
+
+        observer.stop()
+        observer.join()
+
+    return {
+        "observer": description,
+        "startup_s": startup,
+        "idle_cpu_pct": idle_cpu,
+        "latency_median_ms": statistics.median(latencies) * 1e3,
+        "latency_max_ms": max(latencies) * 1e3
+    }
+
+
+def run_bulk(mode: str, files: int, file_kb: int, copy_workers: int, drop: str = "copy") -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        staging, inbox = Path(scratch) / "staging", Path(scratch) / "Inbox"
+        staging.mkdir()
+        inbox.mkdir()
+        payload = random.randbytes(file_kb * 1024)
+        for i in range(files):
+            # Distinct content, or deduplication would skip all but the first
+            (staging / f"scan_{i:05d}.pdf").write_bytes(i.to_bytes(8, "big") + payload[8:])
+
+        filesystem_watcher.NEEDS_ACTION_PATH = Path(scratch) / "Needs_Action"
+        filesystem_watcher.DONE_PATH = Path(scratch) / "Done"
+        filesystem_watcher.DROP_INDEX_PATH = Path(scratch) / "Logs" / "drop_index.sqlite3"
+        ingested = threading.Semaphore(0)
+        handler = DropHandler(copy_workers=copy_workers, metadata_workers=max(1, copy_workers // 2),
+                              on_ingested=lambda drop: ingested.release())
+        observer, description = make_observer(mode, inbox)
+        observer.schedule(handler, str(inbox), recursive=False)
+        observer.start()
+
+        start = time.perf_counter()
+        for source in sorted(staging.iterdir()):
+            if drop == "move":
+                # No close-write event for a rename: drops settle by the quiet window
+                os.rename(source, inbox / source.name)
+            else:
+                shutil.copyfile(source, inbox / source.name)
+        dropped = time.perf_counter() - start
+        for _ in range(files):
+            ingested.acquire()
+        elapsed = time.perf_counter() - start
+
+        observer.stop()
+        observer.join()
+        handler.stop()
+
+    return {
+        "observer": description,
+        "drop_s": dropped,
+        "ingest_s": elapsed,
+        "files_per_s": files / elapsed,
+        "mb_per_s": files * file_kb / 1024 / elapsed
+    }
+
+
+def _kernel_write_bytes() -> int:
+    """Bytes this process caused to be written to storage (0 if not on Linux)."""
+    try:
+        with open("/proc/self/io", "r") as f:
+            for line in f:
+                if line.startswith("write_bytes:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def run_ingest(size_mb: int, directory: Optional[str] = None) -> list:
+    results = []
+    with tempfile.TemporaryDirectory(dir=directory) as scratch:
+        master = Path(scratch) / "master.bin"
+        block = random.randbytes(1024 * 1024)
+        with open(master, "wb") as f:
+            for _ in range(size_mb):
+                f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+
+        for mode in ("shutil.copy2",) + INGEST_MODES:
+            # Each run drops a new name for the same data, so "move" has a source to move
+            src, dest = Path(scratch) / "drop.bin", Path(scratch) / "FILE_drop.bin.md"
+            os.link(master, src)
+
+            written_before = _kernel_write_bytes()
+            start = time.perf_counter()
+            if mode == "shutil.copy2":
+                shutil.copy2(src, dest)
+                method, reported = "copy", size_mb * 1024 * 1024
+            else:
+                method, reported = ingest_file(src, dest, mode)
+            elapsed = time.perf_counter() - start
+            written = _kernel_write_bytes() - written_before
+
+            results.append({
+                "mode": mode,
+                "method": method,
+                "seconds": elapsed,
+                "reported_mb": reported / 1024 / 1024,
+                "kernel_mb": written / 1024 / 1024
+            })
+            dest.unlink()
+            if src.exists():
+                src.unlink()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Inbox observers and the ingest pipeline.")
+    parser.add_argument("--benchmark", choices=("latency", "bulk", "ingest"), default="latency")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated Inbox sizes")
+    parser.add_argument("--observers", default=DEFAULT_OBSERVERS,
+                        help=f"Comma-separated observers ({', '.join(OBSERVER_MODES)})")
+    parser.add_argument("--probes", type=int, default=5, help="Probe files per case")
+    parser.add_argument("--idle", type=float, default=10, help="Seconds of idle CPU measurement")
+    parser.add_argument("--files", type=int, default=500, help="Files per bulk drop")
+    parser.add_argument("--file-kb", type=int, default=1024, help="Size of each bulk file in KB")
+    parser.add_argument("--copy-workers", default="1,4,8", help="Comma-separated copy worker counts (bulk)")
+    parser.add_argument("--drop", choices=("copy", "move"), default="copy", help="How bulk files arrive")
+    parser.add_argument("--ingest-sizes-mb", default="1,64,512,2048", help="Comma-separated file sizes (ingest)")
+    parser.add_argument("--dir", default=None, help="Scratch directory for ingest (default: system temp)")
+    args = parser.parse_args()
+
+    if args.benchmark == "ingest":
+        print(f"{'size MB':>8} {'mode':<13} {'method':<9} {'seconds':>9} {'written MB':>11} {'kernel MB':>10}")
+        for size_mb in (int(n) for n in args.ingest_sizes_mb.split(",")):
+            for result in run_ingest(size_mb, args.dir):
+                print(f"{size_mb:>8} {result['mode']:<13} {result['method']:<9} {result['seconds']:>9.4f} "
+                      f"{result['reported_mb']:>11.1f} {result['kernel_mb']:>10.1f}")
+        return
+
+
+    if args.benchmark == "bulk":
+        mode = args.observers.split(",")[-1]
+        print(f"{'copy workers':>12} {'drop s':>8} {'ingest s':>9} {'files/s':>9} {'MB/s':>8}  ({args.files} x {args.file_kb}KB, {args.drop}, {mode})")
+        for workers in (int(n) for n in args.copy_workers.split(",")):
+            result = run_bulk(mode, args.files, args.file_kb, workers, args.drop)
+            print(f"{workers:>12} {result['drop_s']:>8.2f} {result['ingest_s']:>9.2f} "
+                  f"{result['files_per_s']:>9.1f} {result['mb_per_s']:>8.1f}")
+        return
+
+
+    print(f"{'observer':<10} {'files':>8} {'startup s':>10} {'idle CPU %':>11} {'p50 ms':>9} {'max ms':>9}")
+    for mode in args.observers.split(","):
+        for size in (int(n) for n in args.sizes.split(",")):
+            result = run_case(mode, size, args.probes, args.idle)
+            print(f"{mode:<10} {size:>8} {result['startup_s']:>10.2f} {result['idle_cpu_pct']:>11.2f} "
+                  f"{result['latency_median_ms']:>9.1f} {result['latency_max_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()